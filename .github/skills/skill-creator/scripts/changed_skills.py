@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Changed Skills - Lists the skill folders affected by changes since a git ref
+
+Usage:
+    python changed_skills.py [skills-directory] [--changed-since REF]
+
+Example:
+    python changed_skills.py skills --changed-since origin/main
+    for d in $(python changed_skills.py skills --changed-since HEAD~1); do ...; done
+
+Prints one skill folder (a directory containing SKILL.md) per line. Changes are
+taken from the merge base of REF and HEAD up to the working tree, including
+untracked files. A change under `skills/<name>/` selects that skill; a change to
+the shared tooling in `.github/skills/skill-creator/scripts/` selects every
+skill. Without --changed-since, or when git cannot resolve REF (shallow clone,
+first push of a branch), every skill is listed.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+SHARED_TOOLING = ".github/skills/skill-creator/scripts/"
+
+
+def _git(args, cwd):
+    proc = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return proc.stdout
+
+
+def changed_paths(ref, cwd="."):
+    """
+    Return repo-relative paths changed since the merge base of ref and HEAD.
+
+    Raises:
+        subprocess.CalledProcessError: If git cannot resolve ref
+    """
+    base = _git(["merge-base", ref, "HEAD"], cwd).strip()
+    diff = _git(["diff", "--name-only", base], cwd)
+    untracked = _git(["ls-files", "--others", "--exclude-standard"], cwd)
+    return sorted(set(diff.splitlines() + untracked.splitlines()))
+
+
+def affected_skills(paths, skills_prefix):
+    """
+    Map changed paths to skill names.
+
+    Args:
+        paths: Repo-relative changed paths
+        skills_prefix: Repo-relative skills directory, e.g. "skills"
+
+    Returns:
+        Set of skill names, or None if shared tooling changed and every skill
+        is affected
+    """
+    prefix = skills_prefix.strip("/") + "/"
+    names = set()
+    for path in paths:
+        if path.startswith(SHARED_TOOLING):
+            return None
+        if path.startswith(prefix) and "/" in path[len(prefix):]:
+            names.add(path[len(prefix):].split("/", 1)[0])
+    return names
+
+
+def select_skills(skills_root, ref=None):
+    """
+    List skill folders under skills_root, limited to those changed since ref.
+
+    Args:
+        skills_root: Directory containing one sub-directory per skill
+        ref: Optional git ref; None selects every skill
+
+    Returns:
+        Sorted list of skill folder Paths
+    """
+    skills_root = Path(skills_root)
+    dirs = sorted(d for d in skills_root.iterdir() if (d / "SKILL.md").is_file())
+    if ref is None:
+        return dirs
+    try:
+        top = Path(_git(["rev-parse", "--show-toplevel"], skills_root).strip())
+        paths = changed_paths(ref, top)
+    except (OSError, subprocess.CalledProcessError) as e:
+        detail = e.stderr.strip() if getattr(e, "stderr", None) else e
+        print(f"⚠️  Cannot diff against '{ref}' ({detail}); selecting all skills", file=sys.stderr)
+        return dirs
+    names = affected_skills(paths, skills_root.resolve().relative_to(top).as_posix())
+    if names is None:
+        return dirs
+    return [d for d in dirs if d.name in names]
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="List skill folders affected by changes since a git ref"
+    )
+    p.add_argument(
+        "skills_root", nargs="?", default="skills", help="Skills directory (default: skills)"
+    )
+    p.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only list skills changed since the merge base of REF and HEAD",
+    )
+    args = p.parse_args()
+
+    if not Path(args.skills_root).is_dir():
+        print(f"❌ Error: Skills directory not found: {args.skills_root}", file=sys.stderr)
+        sys.exit(1)
+
+    for skill_dir in select_skills(args.skills_root, args.changed_since):
+        print(skill_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Runner benchmark used by `validate_examples.py --bench`
+
+Every example is run `warmup` times (discarded) and then `iterations` times
+(measured), one at a time, through any runner backend. Results are summarized
+per example and per skill (mean, stddev, min, max, p50/p95/p99, throughput in
+examples/s) and can be saved as a baseline JSON and compared against one.
+"""
+
+import json
+import statistics
+import subprocess
+import time
+
+from example_reports import percentile
+from example_runners import RunnerAborted
+
+BASELINE_VERSION = 1
+STAT_COLUMNS = ("mean", "stddev", "min", "p50", "p95", "p99")
+
+
+def timing_stats(samples):
+    """Summary statistics (in seconds) for a list of timing samples."""
+    return {
+        "runs": len(samples),
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples, default=0.0),
+        "max": max(samples, default=0.0),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
+
+
+def bench_examples(examples, runner, warmup=1, iterations=5, timeout=10):
+    """
+    Time every example through a runner backend.
+
+    Args:
+        examples: Iterable of example dicts
+        runner: Runner backend (see example_runners.py)
+        warmup: Unmeasured runs per example
+        iterations: Measured runs per example
+        timeout: Per-run timeout in seconds
+
+    Returns:
+        Dict with `summary` (all samples) and `examples` (per-example stats
+        plus `id`, `line` and the number of `errors`)
+    """
+    per_example = []
+    all_samples = []
+    for ex in examples:
+        samples = []
+        errors = 0
+        for i in range(warmup + iterations):
+            start = time.perf_counter()
+            try:
+                rc, _, _ = runner.run(ex["input"], timeout=timeout)
+            except (subprocess.TimeoutExpired, RunnerAborted):
+                rc = None
+            elapsed = time.perf_counter() - start
+            if i < warmup:
+                continue
+            samples.append(elapsed)
+            if rc != 0:
+                errors += 1
+        all_samples.extend(samples)
+        per_example.append(
+            {"id": ex["id"], "line": ex.get("line"), "errors": errors, **timing_stats(samples)}
+        )
+
+    summary = timing_stats(all_samples)
+    total = sum(all_samples)
+    summary["throughput"] = len(all_samples) / total if total else 0.0
+    summary["errors"] = sum(e["errors"] for e in per_example)
+    return {"summary": summary, "examples": per_example}
+
+
+def format_bench(bench, name):
+    s = bench["summary"]
+    lines = [
+        f"Benchmark: {name} - {len(bench['examples'])} examples, {s['runs']} measured runs",
+        f"{'Example':<18}" + "".join(f"{col:>11}" for col in STAT_COLUMNS),
+    ]
+    rows = [(f"#{e['id']} (line {e['line']})", e) for e in bench["examples"]]
+    rows.append(("ALL", s))
+    for label, st in rows:
+        cells = "".join(f"{st[col] * 1000:>9.2f}ms" for col in STAT_COLUMNS)
+        lines.append(f"{label:<18}{cells}")
+    lines.append(f"Throughput: {s['throughput']:.1f} examples/s")
+    if s["errors"]:
+        lines.append(f"⚠️  {s['errors']} run(s) exited non-zero, timed out or were aborted")
+    return "\n".join(lines)
+
+
+def save_baseline(path, bench, name, runner_spec, warmup, iterations):
+    data = {
+        "version": BASELINE_VERSION,
+        "skill": name,
+        "runner": runner_spec,
+        "warmup": warmup,
+        "iterations": iterations,
+        **bench,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path):
+    """
+    Load a baseline saved by save_baseline().
+
+    Raises:
+        ValueError: If the file cannot be read or is not a baseline
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"cannot read baseline {path}: {e}")
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} benchmark baseline")
+    summary = baseline.get("summary")
+    if not isinstance(summary, dict) or not all(
+        isinstance(summary.get(key), (int, float)) for key in ("mean", "p95", "throughput")
+    ):
+        raise ValueError(f"{path} has no benchmark summary")
+    return baseline
+
+
+def compare_baseline(path, bench, baseline=None):
+    """Render mean/p95/throughput deltas against a saved baseline (loaded from path if None)."""
+    if baseline is None:
+        baseline = load_baseline(path)
+    old, new = baseline["summary"], bench["summary"]
+    lines = [f"Compared with baseline {path} (runner: {baseline.get('runner')}):"]
+    for key in ("mean", "p95", "throughput"):
+        delta = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        if key == "throughput":
+            change = f"{old[key]:.1f}/s -> {new[key]:.1f}/s"
+        else:
+            change = f"{old[key] * 1000:.2f}ms -> {new[key] * 1000:.2f}ms"
+        lines.append(f"  {key:<10} {change} ({delta:+.1f}%)")
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+"""
+Flakiness statistics used by `validate_examples.py --repeat N`
+
+Every example is run N times. Per example, the runs are reduced to a pass
+rate, the number of distinct outputs (by stdout hash), latency statistics and
+the number of timeouts, and the example is classified as:
+
+- passed: every run passed
+- flaky: some runs failed, but the pass rate is at or above the threshold
+- quarantined: some runs passed, but fewer than the threshold
+- failed: no run passed
+
+Flaky examples fail the run like failed ones: only an example that passes
+every run counts as passing. Quarantined examples are too unreliable to gate
+on; they are reported as skipped and do not fail the run, so a badly
+intermittent runtime does not turn CI red. The rows can be saved as JSON for
+follow-up.
+"""
+
+import hashlib
+import json
+import statistics
+
+DEFAULT_THRESHOLD = 0.5
+REPEAT_REPORT_VERSION = 1
+TIMEOUT_PREFIX = "Runner timed out"
+
+
+def flakiness(example, runs, threshold=DEFAULT_THRESHOLD):
+    """
+    Reduce the repeated results of one example.
+
+    Args:
+        example: Example dict
+        runs: Result dicts of every run of the example; skipped runs are ignored
+        threshold: Pass rate below which a partly passing example is quarantined
+
+    Returns:
+        Dict with `id`, `line`, `hash`, `runs`, `passed`, `pass_rate`,
+        `outputs` (distinct stdout hashes), `mean`, `stdev`, `max` (seconds),
+        `timeouts` and `status`, or None if no run happened
+    """
+    ran = [r for r in runs if not r["skipped"]]
+    if not ran:
+        return None
+    passed = sum(1 for r in ran if r["passed"])
+    durations = [r["duration"] for r in ran]
+    pass_rate = passed / len(ran)
+    if passed == len(ran):
+        status = "passed"
+    elif passed == 0:
+        status = "failed"
+    elif pass_rate >= threshold:
+        status = "flaky"
+    else:
+        status = "quarantined"
+    return {
+        "id": example["id"],
+        "line": example.get("line"),
+        "hash": example.get("hash"),
+        "runs": len(ran),
+        "passed": passed,
+        "pass_rate": pass_rate,
+        "outputs": len({hashlib.sha256(r["stdout"].encode("utf-8")).hexdigest() for r in ran}),
+        "mean": statistics.fmean(durations),
+        "stdev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+        "max": max(durations),
+        "timeouts": sum(1 for r in ran if r["stderr"].startswith(TIMEOUT_PREFIX)),
+        "status": status,
+    }
+
+
+def representative(runs, row):
+    """
+    Pick the result reported for a repeated example: the first failing run, if
+    any, so its diff is shown; a quarantined example becomes a skipped result.
+    """
+    ran = [r for r in runs if not r["skipped"]]
+    if not ran:
+        return runs[-1]
+    failing = [r for r in ran if not r["passed"]]
+    if row["status"] == "quarantined":
+        return {
+            **failing[0],
+            "skipped": True,
+            "quarantined": True,
+            "stderr": f"quarantined: passed {row['passed']} of {row['runs']} runs",
+        }
+    if row["status"] == "flaky":
+        stderr = f"flaky: passed {row['passed']} of {row['runs']} runs\n{failing[0]['stderr']}"
+        return {**failing[0], "stderr": stderr.strip()}
+    return failing[0] if failing else ran[-1]
+
+
+def format_flakiness(rows, name, repeat, timeout):
+    lines = [
+        f"Repeat: {name} - {repeat} run(s) per example",
+        f"{'Example':<18}{'Passed':>8}{'Outputs':>9}{'Mean':>10}{'Stdev':>10}{'Max':>10}"
+        f"{'Timeouts':>10}  Status",
+    ]
+    for row in rows:
+        label = f"#{row['id']} (line {row['line']})"
+        passed = f"{row['passed']}/{row['runs']}"
+        cells = "".join(f"{row[key] * 1000:>8.1f}ms" for key in ("mean", "stdev", "max"))
+        status = row["status"]
+        # Slow runs close to the per-example timeout are the next intermittent failures
+        if row["max"] >= timeout / 2 and status != "failed":
+            status += f" (max is {row['max'] / timeout:.0%} of --timeout)"
+        lines.append(
+            f"{label:<18}{passed:>8}{row['outputs']:>9}{cells}{row['timeouts']:>10}  {status}"
+        )
+    counts = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    lines.append(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return "\n".join(lines)
+
+
+def write_repeat_report(path, rows, name, repeat, threshold):
+    data = {
+        "version": REPEAT_REPORT_VERSION,
+        "skill": name,
+        "repeat": repeat,
+        "threshold": threshold,
+        "examples": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,132 @@
+"""
+Compiled index of parsed examples files used by validate_examples.py
+
+Parsing references/examples.md is skipped when the file's path, size and
+modification time match a stored index entry. An entry is a JSON-lines file:
+a header with the stamp, then one parsed example dict (including its content
+hash) per line. Entries are read and written one example at a time, so an
+indexed run keeps the bounded memory of the streaming parser. They live in
+the `index/` directory of the result cache, so prune_cache() bounds them as
+well.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+INDEX_VERSION = 2
+
+
+class ExampleIndex:
+    """
+    Parsed-examples store keyed by examples file path, size and mtime.
+
+    Args:
+        cache_dir: Result cache directory; entries go to `<cache_dir>/index`
+    """
+
+    def __init__(self, cache_dir):
+        self.index_dir = Path(cache_dir) / "index"
+
+    def _entry(self, examples_path):
+        path = Path(examples_path).resolve()
+        digest = hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+        return path, self.index_dir / f"{digest}.jsonl"
+
+    def load(self, examples_path, parse):
+        """
+        Return the examples of a file as a list; see iter().
+        """
+        return list(self.iter(examples_path, parse))
+
+    def iter(self, examples_path, parse):
+        """
+        Yield the examples of a file, parsing it only if the index is stale.
+
+        On a miss the parsed examples are written to a new entry as they are
+        yielded; the entry only replaces the old one once the file has been
+        parsed to the end.
+
+        Args:
+            examples_path: Path to examples.md
+            parse: Callable yielding the example dicts of the file
+
+        Raises:
+            Whatever parse raises; files that fail to parse are not indexed
+        """
+        path, entry_path = self._entry(examples_path)
+        # Stamped before parsing, so an edit made meanwhile invalidates the entry
+        st = path.stat()
+        header = {
+            "version": INDEX_VERSION,
+            "path": str(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        try:
+            f = open(entry_path, "r", encoding="utf-8")
+        except OSError:
+            f = None
+        if f is not None:
+            with f:
+                try:
+                    fresh = json.loads(f.readline()) == header
+                except ValueError:
+                    fresh = False
+                if fresh:
+                    # Entries are replaced atomically, so the lines after a
+                    # matching header are complete
+                    os.utime(entry_path)
+                    for line in f:
+                        yield json.loads(line)
+                    return
+
+        out, tmp = self._new_entry(entry_path, header)
+        try:
+            for example in parse(examples_path):
+                if out is not None:
+                    try:
+                        out.write(json.dumps(example) + "\n")
+                    except OSError:
+                        out = self._discard(out, tmp)
+                yield example
+        except BaseException:
+            # Parse errors and runs stopped early leave no entry behind
+            if out is not None:
+                self._discard(out, tmp)
+            raise
+        if out is not None:
+            try:
+                out.close()
+                os.replace(tmp, entry_path)
+            except OSError:
+                self._discard(out, tmp)
+
+    @staticmethod
+    def _new_entry(entry_path, header):
+        """Open a temporary entry file next to entry_path, or (None, None)."""
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        except OSError:
+            return None, None
+        out = os.fdopen(fd, "w", encoding="utf-8")
+        try:
+            out.write(json.dumps(header) + "\n")
+        except OSError:
+            ExampleIndex._discard(out, tmp)
+            return None, None
+        return out, tmp
+
+    @staticmethod
+    def _discard(out, tmp):
+        try:
+            out.close()
+        except OSError:
+            pass
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
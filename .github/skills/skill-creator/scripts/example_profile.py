@@ -0,0 +1,139 @@
+"""
+Runner profiling used by `--profile` in validate_examples.py and validate_all.py
+
+Python runners are profiled with cProfile without touching their code:
+
+- `python path/to/script.py` commands run as `python -m cProfile -o <file>
+  path/to/script.py`, one stats file per example
+- --runner-module functions are wrapped in one in-process cProfile.Profile
+
+The stats of all examples of a skill are merged into a single `.pstats` file
+(open it with `python -m pstats`, snakeviz, ...) and summarized as a table of
+the functions with the highest own time.
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import shlex
+import shutil
+import tempfile
+from pathlib import Path
+
+from example_runners import ModuleRunner, is_python_script, run_runner
+
+DEFAULT_TOP = 15
+
+
+def profiled_command(cmd, stats_path):
+    """
+    Rewrite `python script.py [args]` to write cProfile stats to stats_path.
+
+    Raises:
+        ValueError: If cmd is not a `python script.py` command
+    """
+    argv = shlex.split(cmd)
+    if not is_python_script(argv):
+        raise ValueError(f"--profile needs a 'python script.py' runner, got '{cmd}'")
+    return shlex.join([argv[0], "-m", "cProfile", "-o", str(stats_path), *argv[1:]])
+
+
+def merge_stats(paths):
+    """Merge cProfile stats files into one pstats.Stats, or None if there are none."""
+    stats = None
+    for path in paths:
+        if stats is None:
+            stats = pstats.Stats(str(path))
+        else:
+            stats.add(str(path))
+    return stats
+
+
+def save_stats(stats, profile_dir, name):
+    """Write merged stats to `<profile_dir>/<name>.pstats` and return the path."""
+    path = Path(profile_dir) / f"{name}.pstats"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(path)
+    return path
+
+
+def _function_label(func):
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are recorded as ("~", 0, "<built-in method ...>")
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def format_hot_functions(stats, name, runs, top=DEFAULT_TOP):
+    """Table of the `top` functions by own time in merged stats."""
+    lines = [f"Profile: {name} - {runs} profiled run(s), {stats.total_tt * 1000:.2f}ms total"]
+    if not stats.stats:
+        return "\n".join(lines)
+    lines.append(f"{'Calls':>10}{'Own':>12}{'Cumulative':>12}  Function")
+    hottest = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    for func, (_, calls, own, cumulative, _) in hottest[:top]:
+        lines.append(
+            f"{calls:>10}{own * 1000:>10.2f}ms{cumulative * 1000:>10.2f}ms  {_function_label(func)}"
+        )
+    return "\n".join(lines)
+
+
+class ProfilingRunner:
+    """
+    Runner backend that profiles every run of a Python runner.
+
+    Args:
+        runner: ModuleRunner, or a `python script.py` runner command
+        max_output_bytes: Output cap for command runners
+        stats_dir: Directory collecting the stats file of every command run;
+            a temporary one (removed on close) when None
+
+    Runs are never stopped early on an output mismatch, so every profile covers
+    a complete run; timed-out runs leave no stats.
+
+    Raises:
+        ValueError: If the command is not a `python script.py` command
+    """
+
+    def __init__(self, runner, max_output_bytes=None, stats_dir=None):
+        self.runner = runner
+        self.max_output_bytes = max_output_bytes
+        self.runs = 0
+        self.profile = None
+        self.stats_dir = Path(stats_dir) if stats_dir else None
+        self.owns_stats_dir = stats_dir is None
+        if isinstance(runner, ModuleRunner):
+            self.cmd = runner.cmd
+            self.profile = cProfile.Profile()
+            runner.func = functools.partial(self.profile.runcall, runner.func)
+        else:
+            self.cmd = runner
+            profiled_command(runner, "stats.prof")
+            if self.stats_dir is None:
+                self.stats_dir = Path(tempfile.mkdtemp(prefix="runner-profile-"))
+
+    def run(self, input_text, timeout=10, watch=None):
+        if self.profile is not None:
+            self.runs += 1
+            return self.runner.run(input_text, timeout=timeout)
+        # Unique across the worker processes of validate_all.py sharing stats_dir
+        stats_path = self.stats_dir / f"{os.getpid()}-{self.runs}.prof"
+        self.runs += 1
+        return run_runner(
+            profiled_command(self.cmd, stats_path),
+            input_text,
+            timeout,
+            max_output_bytes=self.max_output_bytes,
+        )
+
+    def stats(self):
+        """Merged pstats.Stats of all runs so far, or None."""
+        if self.profile is not None:
+            return pstats.Stats(self.profile) if self.runs else None
+        return merge_stats(sorted(self.stats_dir.glob("*.prof")))
+
+    def close(self):
+        if self.stats_dir is not None and self.owns_stats_dir:
+            shutil.rmtree(self.stats_dir, ignore_errors=True)
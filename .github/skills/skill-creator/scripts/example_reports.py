@@ -0,0 +1,248 @@
+"""
+Latency statistics and machine-readable reports for example validation runs
+
+A suite is a dict with `name`, `examples` (path), `runner` and `results` (the
+result dicts produced by validate_examples.check_example). validate_examples.py
+writes one suite per run and validate_all.py one per skill.
+
+- write_json_report(): {"summary": {...}, "suites": [{..., "summary", "results"}]}
+- write_junit_xml(): <testsuites> with one <testsuite> per suite and per-test `time`
+- format_latency_summary(): p50/p95/p99 and the slowest-N examples as text
+- bounded_diff() / truncate_text(): failure output capped in hunks and bytes
+"""
+
+import hashlib
+import json
+import re
+import xml.etree.ElementTree as ET
+from difflib import SequenceMatcher
+
+DEFAULT_MAX_DIFF_HUNKS = 3
+DEFAULT_MAX_DIFF_BYTES = 16 * 1024
+# Lines after the first difference handed to SequenceMatcher, so diffing a
+# runaway output costs a bounded amount of work
+DIFF_WINDOW_LINES = 2000
+DIFF_CONTEXT = 3
+# Characters outside the XML 1.0 Char production (ANSI escapes, other control
+# characters, surrogates, U+FFFE/U+FFFF); ElementTree writes them unchanged
+RE_XML_INVALID = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+# Result fields copied into the JSON report (stdout/expected stay out of it)
+REPORT_FIELDS = (
+    "id",
+    "line",
+    "passed",
+    "cached",
+    "skipped",
+    "returncode",
+    "duration",
+    "compare_time",
+    "stdout_bytes",
+    "stderr_bytes",
+)
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(results):
+    """Pass/fail counts and latency percentiles (in seconds) for a list of results."""
+    durations = [r["duration"] for r in results if not r.get("skipped")]
+    passed = sum(1 for r in results if r["passed"])
+    skipped = sum(1 for r in results if r.get("skipped"))
+    return {
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed - skipped,
+        "skipped": skipped,
+        "cached": sum(1 for r in results if r.get("cached")),
+        "total_time": sum(durations),
+        "p50": percentile(durations, 50),
+        "p95": percentile(durations, 95),
+        "p99": percentile(durations, 99),
+        "max": max(durations, default=0.0),
+    }
+
+
+def slowest(suites, n):
+    """Return the n slowest (suite name, result) pairs across suites."""
+    pairs = [(suite["name"], r) for suite in suites for r in suite["results"]]
+    pairs.sort(key=lambda pair: pair[1]["duration"], reverse=True)
+    return pairs[:n]
+
+
+def format_latency_summary(suites, top=5):
+    """Render latency percentiles and the slowest examples as text lines."""
+    summary = summarize([r for suite in suites for r in suite["results"]])
+    lines = [
+        f"Latency: n={summary['total'] - summary['skipped']} p50={summary['p50'] * 1000:.1f}ms "
+        f"p95={summary['p95'] * 1000:.1f}ms p99={summary['p99'] * 1000:.1f}ms "
+        f"max={summary['max'] * 1000:.1f}ms"
+    ]
+    ranked = slowest(suites, top)
+    if ranked:
+        lines.append(f"Slowest {len(ranked)}:")
+        for name, r in ranked:
+            where = f"{name} " if len(suites) > 1 else ""
+            lines.append(
+                f"  {where}#{r['id']} (line {r.get('line', '?')}): "
+                f"{r['duration'] * 1000:.1f}ms"
+            )
+    return "\n".join(lines)
+
+
+def describe_text(text):
+    """Length and short SHA-256 of a text, for a quick expected/actual comparison."""
+    data = text.encode("utf-8")
+    return f"{len(data)} bytes, sha256 {hashlib.sha256(data).hexdigest()[:12]}"
+
+
+def truncate_text(text, max_bytes):
+    """Cut text to about max_bytes, noting how much was omitted."""
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    kept = data[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}\n[... {len(data) - max_bytes} more bytes not shown]"
+
+
+def bounded_diff(
+    expected,
+    actual,
+    max_hunks=DEFAULT_MAX_DIFF_HUNKS,
+    max_bytes=DEFAULT_MAX_DIFF_BYTES,
+):
+    """
+    Unified diff of the first max_hunks differing hunks, capped at max_bytes.
+
+    The common line prefix is skipped before matching and at most
+    DIFF_WINDOW_LINES lines per side are compared, so the cost stays bounded
+    however large or different the outputs are.
+
+    Returns:
+        List of diff lines (without trailing newlines)
+    """
+    a = expected.splitlines()
+    b = actual.splitlines()
+    first = 0
+    while first < len(a) and first < len(b) and a[first] == b[first]:
+        first += 1
+    if first == len(a) == len(b):
+        return []
+    offset = max(0, first - DIFF_CONTEXT)
+    a_win = a[offset : offset + DIFF_WINDOW_LINES]
+    b_win = b[offset : offset + DIFF_WINDOW_LINES]
+
+    lines = ["--- expected", "+++ actual"]
+    size = 0
+    hunks = 0
+    matcher = SequenceMatcher(None, a_win, b_win, autojunk=False)
+    for group in matcher.get_grouped_opcodes(DIFF_CONTEXT):
+        if hunks == max_hunks:
+            lines.append(f"[... diff truncated after {max_hunks} hunk(s)]")
+            return lines
+        hunks += 1
+        i1, i2 = group[0][1], group[-1][2]
+        j1, j2 = group[0][3], group[-1][4]
+        hunk = [f"@@ -{offset + i1 + 1},{i2 - i1} +{offset + j1 + 1},{j2 - j1} @@"]
+        for tag, ai1, ai2, bj1, bj2 in group:
+            if tag == "equal":
+                hunk.extend(" " + line for line in a_win[ai1:ai2])
+                continue
+            hunk.extend("-" + line for line in a_win[ai1:ai2])
+            hunk.extend("+" + line for line in b_win[bj1:bj2])
+        for line in hunk:
+            line_bytes = len(line.encode("utf-8")) + 1
+            if size + line_bytes > max_bytes:
+                lines.append(truncate_text(line, max_bytes - size))
+                lines.append(f"[... diff truncated at {max_bytes} bytes]")
+                return lines
+            size += line_bytes
+            lines.append(line)
+    if len(a) - offset > DIFF_WINDOW_LINES or len(b) - offset > DIFF_WINDOW_LINES:
+        lines.append(f"[... lines beyond {offset + DIFF_WINDOW_LINES} not compared]")
+    return lines
+
+
+def failure_message(result):
+    if result.get("skipped"):
+        return result["stderr"]
+    if result["returncode"] is None:
+        # Timed out or stopped early; the reason is the last stderr line
+        reason = result["stderr"].splitlines()[-1:] if result["stderr"] else []
+        return reason[0] if reason else "runner timed out"
+    if result["returncode"] != 0:
+        return f"runner exited with code {result['returncode']}"
+    return "output does not match expected"
+
+
+def write_json_report(path, suites):
+    report = {
+        "summary": summarize([r for suite in suites for r in suite["results"]]),
+        "suites": [
+            {
+                "name": suite["name"],
+                "examples": str(suite["examples"]),
+                "runner": suite["runner"],
+                "summary": summarize(suite["results"]),
+                "results": [
+                    {field: r.get(field) for field in REPORT_FIELDS}
+                    for r in suite["results"]
+                ],
+            }
+            for suite in suites
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def _escape_xml_char(match):
+    code = ord(match.group())
+    return f"\\x{code:02x}" if code < 0x100 else f"\\u{code:04x}"
+
+
+def xml_text(text):
+    """Escape characters XML 1.0 cannot hold as visible `\\xNN` / `\\uNNNN` sequences."""
+    return RE_XML_INVALID.sub(_escape_xml_char, text)
+
+
+def write_junit_xml(path, suites):
+    root = ET.Element("testsuites")
+    for suite in suites:
+        summary = summarize(suite["results"])
+        suite_el = ET.SubElement(
+            root,
+            "testsuite",
+            name=suite["name"],
+            tests=str(summary["total"]),
+            failures=str(summary["failed"]),
+            skipped=str(summary["skipped"]),
+            time=f"{summary['total_time']:.6f}",
+        )
+        for r in suite["results"]:
+            case = ET.SubElement(
+                suite_el,
+                "testcase",
+                classname=suite["name"],
+                name=f"Test #{r['id']} (line {r.get('line', '?')})",
+                time=f"{r['duration']:.6f}",
+            )
+            if r.get("skipped"):
+                ET.SubElement(case, "skipped", message=xml_text(r["stderr"]))
+                continue
+            if not r["passed"]:
+                failure = ET.SubElement(case, "failure", message=xml_text(failure_message(r)))
+                failure.text = xml_text("\n".join(bounded_diff(r["expected"], r["stdout"])))
+            if r["stderr"]:
+                ET.SubElement(case, "system-err").text = xml_text(r["stderr"])
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
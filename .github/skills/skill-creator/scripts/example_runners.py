@@ -0,0 +1,689 @@
+"""
+Runner backends used by validate_examples.py
+
+Every backend exposes `run(input_text, timeout, watch=None)` returning a
+`(returncode, stdout, stderr)` tuple and `close()`:
+
+- CommandRunner: spawns the runner command once per example (default).
+  run_async() / run_runner_async() is the asyncio variant used for --jobs; it
+  runs the command through /bin/sh the same way.
+- PersistentRunner: starts `<command> --serve` once and streams examples to it
+  as JSON lines. Request: {"id": 1, "input": "..."}; response: {"id": 1,
+  "output": "..."} or {"id": 1, "error": "..."}. A probe request with id 0 is
+  sent at start; examples run one process per example until it is answered,
+  and for good if the runner does not speak the protocol.
+- ForkServerRunner: for `python path/to/script.py` commands, keeps a warm
+  interpreter with the script preloaded (runner_fork_server.py) and forks a
+  fresh child per example; other commands run through /bin/sh once per
+  example, as with CommandRunner.
+- ModuleRunner: imports `path/to/mock_runner.py:func` once and calls the
+  function in-process, with the timeout enforced by a watchdog thread.
+
+Runner processes are started in their own session, so a timeout (or a
+cancelled run) kills the whole process group, including anything the runner
+spawned through the shell.
+
+Per-call runners are read incrementally and never buffered beyond
+`max_output_bytes` per stream; a runner that exceeds it is killed. An optional
+`watch` object is fed stdout chunks as they arrive (`feed(chunk) -> bool`) and
+can stop the runner early, e.g. once its output can no longer match. Both
+cases raise RunnerAborted carrying the output captured so far. Persistent
+runners are killed when a single response line exceeds `max_output_bytes`.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import queue
+import re
+import select
+import selectors
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+SERVE_FLAG = "--serve"
+FORK_SERVER = Path(__file__).with_name("runner_fork_server.py")
+RE_PYTHON = re.compile(r"python(\d+(\.\d+)*)?(\.exe)?$")
+DEFAULT_MAX_OUTPUT_BYTES = 16 * 1024 * 1024
+READ_CHUNK = 64 * 1024
+
+
+class RunnerAborted(RuntimeError):
+    """The runner was stopped before it finished; holds the output captured so far."""
+
+    def __init__(self, message, stdout="", stderr=""):
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class StreamCapture:
+    """Collects one output stream, keeping at most max_bytes of it."""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.chunks = []
+        self.size = 0
+
+    def feed(self, chunk):
+        """Store a chunk. Returns False once the stream has exceeded max_bytes."""
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            self.chunks.append(chunk[: len(chunk) - (self.size - self.max_bytes)])
+            return False
+        self.chunks.append(chunk)
+        return True
+
+    def text(self):
+        return b"".join(self.chunks).decode("utf-8", errors="replace").strip()
+
+
+def _capture_chunk(name, chunk, captures, watch):
+    """Feed a stdout/stderr chunk; raise RunnerAborted on overflow or an early mismatch."""
+    capture = captures[name]
+    if not capture.feed(chunk):
+        raise RunnerAborted(
+            f"Runner {name} exceeded {capture.max_bytes} bytes; runner killed",
+            captures["stdout"].text(),
+            captures["stderr"].text(),
+        )
+    if name == "stdout" and watch is not None and not watch.feed(chunk):
+        raise RunnerAborted(
+            "Output diverged from the expected output; runner stopped early",
+            captures["stdout"].text(),
+            captures["stderr"].text(),
+        )
+
+
+def kill_process_group(proc):
+    """Kill a runner started with start_new_session=True and everything it spawned."""
+    if not hasattr(os, "killpg"):
+        proc.kill()
+        return
+    kill_group(proc.pid)
+
+
+def kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_runner(cmd, input_text, timeout=10, max_output_bytes=None, watch=None):
+    """
+    Run a runner on input_text, capturing its output incrementally.
+
+    Args:
+        cmd: Shell command string, or an argv list exec'd without a shell
+
+    Raises:
+        subprocess.TimeoutExpired: If the runner does not finish within timeout
+        RunnerAborted: If a stream exceeds max_output_bytes or watch rejects stdout
+    """
+    deadline = time.monotonic() + timeout
+    with subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        shell=isinstance(cmd, str),
+        start_new_session=True,
+    ) as proc:
+        captures = new_captures(max_output_bytes)
+        try:
+            exchange(
+                (proc.stdin, proc.stdout, proc.stderr),
+                input_text.encode("utf-8"),
+                deadline,
+                captures,
+                watch,
+            )
+            proc.wait(timeout=max(0, deadline - time.monotonic()))
+        except (subprocess.TimeoutExpired, RunnerAborted) as e:
+            kill_process_group(proc)
+            if isinstance(e, subprocess.TimeoutExpired):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            raise
+    return proc.returncode, captures["stdout"].text(), captures["stderr"].text()
+
+
+def new_captures(max_output_bytes):
+    return {"stdout": StreamCapture(max_output_bytes), "stderr": StreamCapture(max_output_bytes)}
+
+
+def exchange(pipes, data, deadline, captures, watch):
+    """
+    Feed data to a runner's stdin and capture stdout/stderr until both close.
+
+    Args:
+        pipes: (stdin, stdout, stderr) binary file objects on the runner's pipes
+        data: Input bytes
+        deadline: time.monotonic() value by which both streams must be closed
+        captures: Dict from new_captures()
+        watch: Optional stdout watch (see module docstring)
+
+    Raises:
+        subprocess.TimeoutExpired: If the deadline passes first
+        RunnerAborted: If a stream exceeds its cap or watch rejects stdout
+    """
+    stdin, stdout, stderr = pipes
+    streams = {stdout: "stdout", stderr: "stderr"}
+    offset = 0
+    with selectors.DefaultSelector() as selector:
+        if data:
+            selector.register(stdin, selectors.EVENT_WRITE)
+        else:
+            stdin.close()
+        for stream in streams:
+            selector.register(stream, selectors.EVENT_READ)
+
+        while selector.get_map():
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise subprocess.TimeoutExpired("runner", 0)
+            for key, _ in selector.select(left):
+                if key.fileobj is stdin:
+                    try:
+                        # PIPE_BUF-sized writes never block on a writable pipe
+                        offset += os.write(key.fd, data[offset : offset + select.PIPE_BUF])
+                    except BrokenPipeError:
+                        offset = len(data)
+                    if offset >= len(data):
+                        selector.unregister(stdin)
+                        stdin.close()
+                    continue
+                chunk = os.read(key.fd, READ_CHUNK)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                _capture_chunk(streams[key.fileobj], chunk, captures, watch)
+
+
+async def run_runner_async(cmd, input_text, timeout=10, max_output_bytes=None, watch=None):
+    """
+    Async run_runner(): run the command string through the shell.
+
+    The runner's process group is killed on timeout, when its output is
+    aborted, and when the awaiting task is cancelled (--fail-fast), so no
+    straggler outlives the run.
+    """
+    proc = await asyncio.create_subprocess_shell(
+        cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    captures = new_captures(max_output_bytes)
+
+    async def feed_stdin():
+        try:
+            proc.stdin.write(input_text.encode("utf-8"))
+            await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def pump(name, stream):
+        while True:
+            chunk = await stream.read(READ_CHUNK)
+            if not chunk:
+                return
+            _capture_chunk(name, chunk, captures, watch)
+
+    tasks = [
+        asyncio.ensure_future(feed_stdin()),
+        asyncio.ensure_future(pump("stdout", proc.stdout)),
+        asyncio.ensure_future(pump("stderr", proc.stderr)),
+    ]
+
+    async def communicate():
+        await asyncio.gather(*tasks)
+        await proc.wait()
+
+    try:
+        await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _reap(proc, tasks)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except (RunnerAborted, asyncio.CancelledError):
+        await _reap(proc, tasks)
+        raise
+    return proc.returncode, captures["stdout"].text(), captures["stderr"].text()
+
+
+async def _reap(proc, tasks):
+    """Kill the runner group and drain its pipes; asyncio only reports exit after EOF."""
+    kill_process_group(proc)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for stream in (proc.stdout, proc.stderr):
+        while await stream.read(READ_CHUNK):
+            pass
+    await proc.wait()
+
+
+def is_python_script(argv):
+    """True for a `python path/to/script.py [args]` command line."""
+    return (
+        len(argv) >= 2
+        and RE_PYTHON.match(Path(argv[0]).name) is not None
+        and argv[1].endswith(".py")
+        and Path(argv[1]).is_file()
+    )
+
+
+class RunnerProtocolError(RuntimeError):
+    """The persistent runner died or answered with something other than a JSON line."""
+
+
+class CommandRunner:
+    """One shell invocation per example."""
+
+    def __init__(self, cmd, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+        self.cmd = cmd
+        self.max_output_bytes = max_output_bytes
+
+    def run(self, input_text, timeout=10, watch=None):
+        return run_runner(
+            self.cmd, input_text, timeout, max_output_bytes=self.max_output_bytes, watch=watch
+        )
+
+    async def run_async(self, input_text, timeout=10, watch=None):
+        return await run_runner_async(
+            self.cmd, input_text, timeout, max_output_bytes=self.max_output_bytes, watch=watch
+        )
+
+    def close(self):
+        pass
+
+
+class PersistentRunner:
+    """
+    Long-lived runner speaking the JSON-lines protocol on stdin/stdout.
+
+    The process is started lazily with a probe request (id 0, empty input)
+    and restarted after a timeout. Until the probe is answered, examples run
+    one process per example, so a runner that is slow to start costs no
+    example its timeout. Anything the runner writes to stderr while handling
+    a request is returned with that request's result. If the runner dies or
+    answers with something that is not a protocol line, the runner switches
+    to CommandRunner behaviour for the rest of the run; a plain runner that
+    waits for the end of stdin never answers the probe and is only killed by
+    close().
+    """
+
+    def __init__(self, cmd, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+        self.cmd = cmd
+        self.max_output_bytes = max_output_bytes
+        self.proc = None
+        self.next_id = 0
+        self.fallback_reason = None
+        self.answered = False
+
+    def _start(self):
+        self.proc = subprocess.Popen(
+            f"{self.cmd} {SERVE_FLAG}",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=True,
+            start_new_session=True,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.lines = queue.Queue()
+        self.stderr = queue.Queue()
+        for stream, sink in ((self.proc.stdout, self.lines), (self.proc.stderr, self.stderr)):
+            threading.Thread(
+                target=self._pump, args=(stream, sink.put, self.max_output_bytes), daemon=True
+            ).start()
+
+    @staticmethod
+    def _pump(stream, sink, limit):
+        # readline(limit) hands over an overlong line in pieces instead of buffering it whole
+        while True:
+            line = stream.readline(limit or -1)
+            if not line:
+                break
+            sink(line)
+        sink(None)
+
+    def _take_stderr(self):
+        chunks = []
+        while True:
+            try:
+                chunk = self.stderr.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is not None:
+                chunks.append(chunk)
+        return "".join(chunks).strip()
+
+    def run(self, input_text, timeout=10, watch=None):
+        deadline = time.monotonic() + timeout
+        if self.fallback_reason is None:
+            try:
+                if self._ready():
+                    return self._request(input_text, timeout)
+            except RunnerProtocolError as e:
+                self.fallback_reason = str(e)
+                # Only the time left of this example's timeout, so a --budget holds
+                rc, out, err = self._run_once(
+                    input_text, max(0, deadline - time.monotonic()), watch
+                )
+                warning = f"Persistent runner unavailable ({e}); using one process per example"
+                return rc, out, f"{warning}\n{err}".strip()
+        return self._run_once(input_text, timeout, watch)
+
+    def _run_once(self, input_text, timeout, watch):
+        return run_runner(
+            self.cmd, input_text, timeout, max_output_bytes=self.max_output_bytes, watch=watch
+        )
+
+    def _send(self, request_id, input_text):
+        try:
+            self.proc.stdin.write(json.dumps({"id": request_id, "input": input_text}) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            self.close()
+            raise RunnerProtocolError(f"runner exited before accepting input: {e}")
+
+    def _ready(self):
+        """Start the runner and probe it; True once it has answered with a protocol line."""
+        if self.answered:
+            return True
+        if self.proc is None:
+            self._start()
+            self._send(0, "")
+        try:
+            line = self.lines.get_nowait()
+        except queue.Empty:
+            return False
+        self._parse(line)
+        self.answered = True
+        # Whatever the probe wrote to stderr belongs to no example
+        self._take_stderr()
+        return True
+
+    def _parse(self, line):
+        """Decode one response line; raise RunnerProtocolError or RunnerAborted."""
+        if line is None:
+            err = self._take_stderr()
+            self.close()
+            raise RunnerProtocolError(f"runner exited without a response: {err}")
+        if self.max_output_bytes and len(line) >= self.max_output_bytes and not line.endswith("\n"):
+            err = self._take_stderr()
+            self.close(kill=True)
+            raise RunnerAborted(
+                f"Runner response exceeded {self.max_output_bytes} bytes; runner killed",
+                stderr=err,
+            )
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            self.close()
+            raise RunnerProtocolError(f"not a JSON-lines response: {line.strip()[:200]}")
+
+    def _request(self, input_text, timeout):
+        if self.proc is None or self.proc.poll() is not None:
+            self._start()
+        self.next_id += 1
+        request_id = self.next_id
+        self._send(request_id, input_text)
+
+        while True:
+            try:
+                line = self.lines.get(timeout=timeout)
+            except queue.Empty:
+                self.close(kill=True)
+                raise subprocess.TimeoutExpired(self.cmd, timeout)
+            response = self._parse(line)
+            # Skips the answers to the probe and to requests that timed out
+            if isinstance(response, dict) and response.get("id") == request_id:
+                break
+
+        if "error" in response:
+            return 1, "", (str(response["error"]) + "\n" + self._take_stderr()).strip()
+        output = response.get("output")
+        return 0, "" if output is None else str(output).strip(), self._take_stderr()
+
+    def close(self, kill=False):
+        if self.proc is None:
+            return
+        if not kill and self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        if self.proc.poll() is None:
+            kill_process_group(self.proc)
+            self.proc.wait()
+        self.proc = None
+
+
+class ForkServerRunner:
+    """
+    Runner forked per example from a warm interpreter.
+
+    `python path/to/script.py [args]` commands get a fork server (started
+    lazily, restarted after a timeout) that has already loaded the interpreter,
+    the script and its imports, so each example only pays for a fork. Every
+    child runs in its own session, which is killed on timeout. Other commands,
+    platforms without fork, or a server that fails to start fall back to
+    running the command through the shell once per example.
+    """
+
+    def __init__(self, cmd, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+        self.cmd = cmd
+        self.argv = shlex.split(cmd)
+        self.max_output_bytes = max_output_bytes
+        self.server = None
+        self.sock = None
+        self.fallback_reason = None
+        if not (hasattr(os, "fork") and hasattr(socket, "send_fds")):
+            self.fallback_reason = "fork is not available on this platform"
+        elif not is_python_script(self.argv):
+            self.fallback_reason = "not a 'python script.py' command"
+        elif not FORK_SERVER.is_file():
+            # Packaged skills bundle only the modules of a plain run
+            self.fallback_reason = f"{FORK_SERVER.name} is not available"
+
+    def run(self, input_text, timeout=10, watch=None):
+        if self.fallback_reason is None:
+            try:
+                return self._request(input_text, timeout, watch)
+            except RunnerProtocolError as e:
+                self.fallback_reason = str(e)
+                rc, out, err = self._exec(input_text, timeout, watch)
+                warning = f"Fork server unavailable ({e}); using one process per example"
+                return rc, out, f"{warning}\n{err}".strip()
+        return self._exec(input_text, timeout, watch)
+
+    def _exec(self, input_text, timeout, watch):
+        return run_runner(
+            self.cmd, input_text, timeout, max_output_bytes=self.max_output_bytes, watch=watch
+        )
+
+    def _start(self, timeout):
+        parent, child = socket.socketpair()
+        with child:
+            try:
+                self.server = subprocess.Popen(
+                    [self.argv[0], str(FORK_SERVER), str(child.fileno()), *self.argv[1:]],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    pass_fds=[child.fileno()],
+                    start_new_session=True,
+                )
+            except OSError as e:
+                parent.close()
+                raise RunnerProtocolError(f"cannot start fork server: {e}")
+        self.sock = parent
+        self.replies = parent.makefile("rb")
+        try:
+            status, _, detail = self._reply(timeout)
+        except subprocess.TimeoutExpired:
+            self.close()
+            raise RunnerProtocolError(f"fork server did not start within {timeout}s")
+        if status != "ready":
+            self.close()
+            raise RunnerProtocolError(f"cannot preload runner: {detail or status}")
+
+    def _reply(self, timeout):
+        self.sock.settimeout(max(timeout, 0.001))
+        try:
+            line = self.replies.readline()
+        except socket.timeout:
+            raise subprocess.TimeoutExpired(self.cmd, timeout)
+        except OSError as e:
+            raise RunnerProtocolError(f"fork server connection failed: {e}")
+        if not line:
+            raise RunnerProtocolError("fork server exited")
+        return line.decode("utf-8").rstrip("\n").partition(" ")
+
+    def _request(self, input_text, timeout, watch):
+        deadline = time.monotonic() + timeout
+        if self.server is None or self.server.poll() is not None:
+            self._start(timeout)
+        child_fds = []
+        pipes = []
+        for mode in ("wb", "rb", "rb"):
+            r, w = os.pipe()
+            child_fds.append(r if mode == "wb" else w)
+            pipes.append(open(w if mode == "wb" else r, mode, buffering=0))
+        try:
+            try:
+                socket.send_fds(self.sock, [b"run\n"], child_fds)
+            except OSError as e:
+                self.close()
+                raise RunnerProtocolError(f"fork server exited: {e}")
+            finally:
+                for fd in child_fds:
+                    os.close(fd)
+            status, _, pid = self._reply(max(0, deadline - time.monotonic()))
+            if status != "pid":
+                self.close()
+                raise RunnerProtocolError(f"unexpected fork server reply: {status}")
+            pid = int(pid)
+
+            captures = new_captures(self.max_output_bytes)
+            try:
+                exchange(pipes, input_text.encode("utf-8"), deadline, captures, watch)
+                status, _, code = self._reply(max(0, deadline - time.monotonic()))
+            except (subprocess.TimeoutExpired, RunnerAborted, RunnerProtocolError) as e:
+                kill_group(pid)
+                # Replies of an abandoned request would be out of step; restart the server
+                self.close()
+                if isinstance(e, subprocess.TimeoutExpired):
+                    raise subprocess.TimeoutExpired(self.cmd, timeout)
+                raise
+            return int(code), captures["stdout"].text(), captures["stderr"].text()
+        finally:
+            for pipe in pipes:
+                pipe.close()
+
+    def close(self):
+        if self.server is None:
+            return
+        self.replies.close()
+        self.sock.close()
+        try:
+            self.server.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            kill_process_group(self.server)
+            self.server.wait()
+        self.server = None
+
+
+def load_callable(spec):
+    """
+    Load `path/to/module.py:func` via importlib.
+
+    Args:
+        spec: Module path and attribute name separated by `:`
+
+    Returns:
+        The callable
+
+    Raises:
+        ValueError: If the spec is malformed, the module fails to import or it
+            does not name a callable
+    """
+    path, sep, attr = spec.rpartition(":")
+    if not sep or not path or not attr:
+        raise ValueError(f"expected 'path/to/module.py:function', got '{spec}'")
+    module_path = Path(path).resolve()
+    if not module_path.is_file():
+        raise ValueError(f"runner module not found: {module_path}")
+
+    # Let the runner import its siblings, as it would when run as a script
+    if str(module_path.parent) not in sys.path:
+        sys.path.append(str(module_path.parent))
+    module_name = f"_runner_{abs(hash(str(module_path))):x}_{module_path.stem}"
+    module_spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(module_spec)
+    try:
+        module_spec.loader.exec_module(module)
+    except Exception as e:
+        raise ValueError(f"cannot import {module_path.name}: {type(e).__name__}: {e}") from e
+
+    func = getattr(module, attr, None)
+    if not callable(func):
+        raise ValueError(f"{module_path.name} has no callable '{attr}'")
+    return func
+
+
+class ModuleRunner:
+    """
+    In-process runner calling a Python function with the example input.
+
+    The function returns the output text; None counts as empty output, and any
+    other non-str result fails the example.
+    Each call runs on a daemon watchdog thread so the timeout can be enforced.
+    A call that overruns cannot be killed; its thread is abandoned and does not
+    keep the validator alive at exit.
+    """
+
+    def __init__(self, spec):
+        self.cmd = spec
+        self.func = load_callable(spec)
+
+    def run(self, input_text, timeout=10, watch=None):
+        outcome = {}
+
+        def call():
+            try:
+                outcome["output"] = self.func(input_text)
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=call, daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            raise subprocess.TimeoutExpired(self.cmd, timeout)
+        if "error" in outcome:
+            e = outcome["error"]
+            return 1, "", f"{type(e).__name__}: {e}"
+        output = outcome["output"]
+        if output is None:
+            output = ""
+        if not isinstance(output, str):
+            return 1, "", f"runner function returned {type(output).__name__}, expected str"
+        return 0, output.strip(), ""
+
+    def close(self):
+        pass
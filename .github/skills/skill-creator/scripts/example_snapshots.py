@@ -0,0 +1,121 @@
+"""
+Golden snapshots of real runner output for --record / --replay
+
+A snapshot store is one JSON file per examples file (by default
+`examples.snapshots.json` next to `examples.md`) mapping a hash of each example
+input to the runner's recorded `returncode`, `stdout` and `stderr`. Keys depend
+on the input only, so editing an expected output never forces a re-record and
+editing an input records just that example.
+
+SnapshotRunner is a runner backend (see example_runners.py): in replay mode it
+answers from the store and never starts the runtime; in record mode it runs the
+real runner for inputs that have no snapshot yet and stores the outcome.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from example_runners import RunnerAborted
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(examples_path):
+    """Default store location: `examples.md` -> `examples.snapshots.json`."""
+    return Path(examples_path).with_suffix(".snapshots.json")
+
+
+def input_hash(input_text):
+    return hashlib.sha256(input_text.encode("utf-8")).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Recorded runner outcomes of one examples file, keyed by input_hash()."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.snapshots = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"{self.path}: unsupported snapshot version {data.get('version')}")
+        self.snapshots = data.get("snapshots", {})
+
+    def get(self, input_text):
+        return self.snapshots.get(input_hash(input_text))
+
+    def put(self, input_text, rc, stdout, stderr):
+        self.snapshots[input_hash(input_text)] = {
+            "returncode": rc,
+            "stdout": stdout,
+            "stderr": stderr,
+        }
+
+    def save(self, inputs):
+        """Write the store, keeping only snapshots of the given (current) inputs."""
+        keep = {input_hash(text) for text in inputs}
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "snapshots": {k: v for k, v in self.snapshots.items() if k in keep},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, self.path)
+
+
+def record_results(store, examples, results):
+    """
+    Store the outcome of examples that ran to completion and had no snapshot.
+
+    Returns:
+        Number of snapshots added
+    """
+    added = 0
+    for example, result in zip(examples, results):
+        if result["skipped"] or result["returncode"] is None:
+            continue
+        if store.get(example["input"]) is None:
+            store.put(example["input"], result["returncode"], result["stdout"], result["stderr"])
+            added += 1
+    return added
+
+
+class SnapshotRunner:
+    """
+    Runner backend answering from a SnapshotStore.
+
+    Args:
+        store: SnapshotStore to read (and, when recording, update)
+        runner: Real runner backend used for inputs without a snapshot, or None
+            to replay only
+    """
+
+    def __init__(self, store, runner=None):
+        self.store = store
+        self.runner = runner
+        self.cmd = f"snapshots:{store.path}"
+        self.recorded = 0
+
+    def run(self, input_text, timeout=10, watch=None):
+        snapshot = self.store.get(input_text)
+        if snapshot is not None:
+            return snapshot["returncode"], snapshot["stdout"], snapshot["stderr"]
+        if self.runner is None:
+            raise RunnerAborted(f"No snapshot of this input in {self.store.path}; run --record")
+        # No early-mismatch watch: a recording keeps the runner's complete output
+        rc, out, err = self.runner.run(input_text, timeout=timeout)
+        self.store.put(input_text, rc, out, err)
+        self.recorded += 1
+        return rc, out, err
+
+    def close(self):
+        if self.runner is not None:
+            self.runner.close()
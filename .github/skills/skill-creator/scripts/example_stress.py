@@ -0,0 +1,274 @@
+"""
+Runner stress test used by `validate_examples.py --stress`
+
+Synthetic inputs of growing size (1 KiB to 10 MiB by default) are built from
+the example inputs with three strategies:
+
+- repeat: the largest example input, repeated
+- concat: all example inputs, concatenated in turn
+- mutate: like concat, with words of every copy dropped, duplicated, swapped or
+  re-cased (seeded, so inputs are reproducible)
+
+Every input is run through the runner in a forked measuring process, so each
+run reports its own wall time and peak memory: the maximum RSS of the runner
+processes for command runners, traced Python allocations for in-process module
+runners. A power law `latency ~ size**k` is then fitted per strategy on a
+log-log scale after subtracting the fixed per-call cost measured on an empty
+input, and likewise for memory. Exponents above a threshold are flagged as
+super-linear. Once a size fails or times out, larger sizes of that strategy are
+not attempted.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from example_runners import ModuleRunner
+
+STRATEGIES = ("repeat", "concat", "mutate")
+# 1 KiB to 10 MiB in steps of 4, so several points land above the fixed cost
+DEFAULT_SIZES = tuple(1024 * 4**i for i in range(7)) + (10 * 1024**2,)
+DEFAULT_MAX_EXPONENT = 1.2
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2}
+# Share of words touched per copy by the mutate strategy
+MUTATION_RATE = 0.1
+
+
+def parse_sizes(value):
+    """Parse a comma-separated size list such as "1K,64K,1M" into bytes for argparse."""
+    sizes = []
+    for item in value.split(","):
+        item = item.strip().upper().removesuffix("B").removesuffix("I")
+        unit = item[-1:] if item[-1:] in SIZE_UNITS else ""
+        try:
+            size = int(float(item[: len(item) - len(unit)]) * SIZE_UNITS[unit])
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid size list '{value}'")
+        if size < 1:
+            raise argparse.ArgumentTypeError(f"sizes must be positive, got '{value}'")
+        sizes.append(size)
+    return sorted(set(sizes))
+
+
+def format_size(size):
+    for unit, scale in (("MiB", 1024**2), ("KiB", 1024)):
+        if size >= scale:
+            return f"{size / scale:.1f}{unit}"
+    return f"{size}B"
+
+
+def mutate(text, rng):
+    words = text.split(" ")
+    for _ in range(max(1, int(len(words) * MUTATION_RATE))):
+        i = rng.randrange(len(words))
+        op = rng.randrange(4)
+        if op == 0 and len(words) > 1:
+            del words[i]
+        elif op == 1:
+            words.insert(i, words[i])
+        elif op == 2:
+            j = rng.randrange(len(words))
+            words[i], words[j] = words[j], words[i]
+        else:
+            words[i] = words[i].swapcase()
+    return " ".join(words)
+
+
+def build_input(inputs, strategy, size, seed=0):
+    """
+    Build a synthetic input of about `size` UTF-8 bytes from example inputs.
+
+    Args:
+        inputs: Non-empty list of example input strings
+        strategy: One of STRATEGIES
+        size: Target size in bytes; the text is cut at a character boundary
+        seed: Seed for the mutate strategy
+    """
+    rng = random.Random(seed)
+    largest = max(inputs, key=len)
+    parts = []
+    total = 0
+    i = 0
+    while total < size:
+        if strategy == "repeat":
+            text = largest
+        else:
+            text = inputs[i % len(inputs)]
+            i += 1
+        if strategy == "mutate":
+            text = mutate(text, rng)
+        parts.append(text)
+        total += len(text.encode("utf-8")) + 2
+    data = "\n\n".join(parts).encode("utf-8")[:size]
+    return data.decode("utf-8", errors="ignore")
+
+
+def measure_run(runner, text, timeout):
+    """
+    Run one input in a forked child and measure it there.
+
+    The child's RUSAGE_CHILDREN covers exactly the runner processes of this run;
+    module runners execute inside the child and are measured with tracemalloc.
+
+    Returns:
+        Dict with `seconds`, `memory` (peak bytes) and `status` ("ok", "exit N",
+        "timeout" or an error message)
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            in_process = isinstance(runner, ModuleRunner)
+            if in_process:
+                tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                rc, _, _ = runner.run(text, timeout=timeout)
+                status = "ok" if rc == 0 else f"exit {rc}"
+            except subprocess.TimeoutExpired:
+                status = "timeout"
+            except Exception as e:
+                status = f"{type(e).__name__}: {e}"
+            seconds = time.perf_counter() - start
+            if in_process:
+                memory = tracemalloc.get_traced_memory()[1]
+            else:
+                memory = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+                # ru_maxrss is in KiB on Linux and in bytes on macOS
+                memory *= 1 if sys.platform == "darwin" else 1024
+            with os.fdopen(write_fd, "w") as f:
+                json.dump({"seconds": seconds, "memory": memory, "status": status}, f)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        data = f.read()
+    os.waitpid(pid, 0)
+    if not data:
+        return {"seconds": 0.0, "memory": 0, "status": "measuring process died"}
+    return json.loads(data)
+
+
+def best_of(runner, text, runs, timeout):
+    """Fastest of `runs` measured runs (stopping at the first failure); memory is the max."""
+    measured = []
+    for _ in range(runs):
+        m = measure_run(runner, text, timeout)
+        measured.append(m)
+        if m["status"] != "ok":
+            return m
+    best = min(measured, key=lambda m: m["seconds"])
+    return {**best, "memory": max(m["memory"] for m in measured)}
+
+
+def fit_exponent(points, fixed):
+    """
+    Fit value ~ size**k on the part of each value above the fixed cost.
+
+    Only points whose variable part is at least the fixed cost are used, so
+    start-up noise does not distort the curve.
+
+    Returns:
+        k, or None with fewer than two usable points
+    """
+    usable = [(size, value - fixed) for size, value in points if value - fixed >= max(fixed, 1e-9)]
+    if len(usable) < 2:
+        return None
+    xs = [math.log(size) for size, _ in usable]
+    ys = [math.log(value) for _, value in usable]
+    return statistics.linear_regression(xs, ys).slope
+
+
+def stress_examples(
+    examples,
+    runner,
+    sizes=DEFAULT_SIZES,
+    runs=3,
+    timeout=10,
+    max_exponent=DEFAULT_MAX_EXPONENT,
+    seed=0,
+):
+    """
+    Measure how a runner scales with input size.
+
+    Args:
+        examples: Iterable of example dicts; their inputs seed the synthetic inputs
+        runner: Runner backend (see example_runners.py)
+        sizes: Input sizes in bytes
+        runs: Measured runs per input; the fastest is kept
+        timeout: Per-run timeout in seconds
+        max_exponent: Flag fitted exponents above this as super-linear
+        seed: Seed for the mutate strategy
+
+    Returns:
+        Dict with `fixed` (measurement of an empty input) and `strategies`,
+        each holding `points`, `latency_exponent`, `memory_exponent`,
+        `fails_at` (first failing size or None) and `flagged`
+
+    Raises:
+        ValueError: If no example has a non-empty input
+    """
+    inputs = [ex["input"] for ex in examples if ex["input"]]
+    if not inputs:
+        raise ValueError("no example with a non-empty input to build stress inputs from")
+    fixed = best_of(runner, "", runs, timeout)
+    report = {"fixed": fixed, "strategies": {}}
+    for strategy in STRATEGIES:
+        points = []
+        fails_at = None
+        for size in sorted(sizes):
+            m = best_of(runner, build_input(inputs, strategy, size, seed), runs, timeout)
+            points.append({"size": size, **m})
+            if m["status"] != "ok":
+                fails_at = size
+                break
+        ok = [p for p in points if p["status"] == "ok"]
+        latency = fit_exponent([(p["size"], p["seconds"]) for p in ok], fixed["seconds"])
+        memory = fit_exponent([(p["size"], p["memory"]) for p in ok], fixed["memory"])
+        report["strategies"][strategy] = {
+            "points": points,
+            "latency_exponent": latency,
+            "memory_exponent": memory,
+            "fails_at": fails_at,
+            "flagged": fails_at is not None
+            or any(k is not None and k > max_exponent for k in (latency, memory)),
+        }
+    return report
+
+
+def _exponent(k):
+    return "too fast to fit" if k is None else f"size^{k:.2f}"
+
+
+def format_stress(report, name, max_exponent=DEFAULT_MAX_EXPONENT):
+    fixed = report["fixed"]
+    lines = [
+        f"Stress: {name} - fixed cost {fixed['seconds'] * 1000:.2f}ms, "
+        f"{format_size(fixed['memory'])} (empty input)",
+        f"{'Strategy':<10}{'Size':>10}{'Latency':>12}{'Memory':>12}  Status",
+    ]
+    for strategy, s in report["strategies"].items():
+        for p in s["points"]:
+            lines.append(
+                f"{strategy:<10}{format_size(p['size']):>10}{p['seconds'] * 1000:>10.2f}ms"
+                f"{format_size(p['memory']):>12}  {p['status']}"
+            )
+    for strategy, s in report["strategies"].items():
+        latency, memory = s["latency_exponent"], s["memory_exponent"]
+        line = f"{strategy}: latency ~ {_exponent(latency)}, memory ~ {_exponent(memory)}"
+        problems = []
+        if any(k is not None and k > max_exponent for k in (latency, memory)):
+            problems.append(f"super-linear (> size^{max_exponent:g})")
+        if s["fails_at"] is not None:
+            problems.append(f"fails at {format_size(s['fails_at'])}")
+        lines.append(f"⚠️  {line} - {', '.join(problems)}" if problems else f"  {line}")
+    return "\n".join(lines)
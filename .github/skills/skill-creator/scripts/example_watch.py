@@ -0,0 +1,208 @@
+"""
+Watch mode used by `validate_all.py --watch`
+
+Watches every skill's `references/examples.md` and `scripts/*.py` and, on
+save, re-runs only what changed: examples whose content hash (input and
+expected output) is new, or all examples of a skill whose runner sources
+changed. Each skill keeps one warm `--serve` runner (see example_runners.py)
+that is restarted when its sources change.
+
+File changes come from inotify on Linux (through ctypes, no extra
+dependency) and from polling file stats everywhere else.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+POLL_INTERVAL = 0.5
+# Editors often save in several steps (write, rename, chmod); wait for the burst to end
+DEBOUNCE = 0.1
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_EVENT_HEADER = struct.Struct("iIII")
+
+
+def watched_file(path):
+    """True for the files that affect a skill's examples run."""
+    return (path.parent.name == "references" and path.name == "examples.md") or (
+        path.parent.name == "scripts" and path.suffix == ".py"
+    )
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) of the watched files."""
+
+    def __init__(self, dirs):
+        self.dirs = [Path(d) for d in dirs]
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        stats = {}
+        for d in self.dirs:
+            try:
+                entries = list(d.iterdir())
+            except OSError:
+                continue
+            for path in entries:
+                if not watched_file(path):
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def wait(self):
+        """Block until watched files change. Returns the set of changed paths."""
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = self._scan()
+            changed = {
+                path
+                for path in current.keys() | self.snapshot.keys()
+                if current.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = current
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify on the watched directories.
+
+    Raises:
+        OSError: If inotify is unavailable
+    """
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), self.MASK)
+            if wd >= 0:
+                self.dirs[wd] = Path(d)
+
+    def _read(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+                offset += IN_EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if wd in self.dirs and name:
+                    path = self.dirs[wd] / os.fsdecode(name)
+                    if watched_file(path):
+                        changed.add(path)
+
+    def wait(self):
+        """Block until watched files change. Returns the set of changed paths."""
+        while True:
+            select.select([self.fd], [], [])
+            time.sleep(DEBOUNCE)
+            changed = self._read()
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(dirs):
+    """inotify when available, polling otherwise."""
+    try:
+        return InotifyWatcher(dirs)
+    except (OSError, AttributeError, TypeError):
+        return PollingWatcher(dirs)
+
+
+def watch_skills(skills, run, load, render, make_runner):
+    """
+    Validate skills once, then re-run affected examples whenever files change.
+
+    Args:
+        skills: Skill dicts as returned by validate_all.discover_skills()
+        run: Callable (examples, runner, on_result) -> list of result dicts
+        load: Callable loading the example list of an examples file
+        render: Callable (result, skill name) -> text
+        make_runner: Callable mapping a runner command to a warm runner backend
+
+    Runs until interrupted.
+    """
+    state = {
+        skill["name"]: {"skill": skill, "runner": None, "results": {}} for skill in skills
+    }
+
+    def refresh(name, rerun_all=False):
+        entry = state[name]
+        skill = entry["skill"]
+        if rerun_all and entry["runner"] is not None:
+            entry["runner"].close()
+            entry["runner"] = None
+        if entry["runner"] is None:
+            entry["runner"] = make_runner(skill["runner"])
+        try:
+            examples = load(skill["examples"])
+        except (OSError, ValueError) as e:
+            print(f"🚦 {name}: error parsing examples: {e}", flush=True)
+            return
+        previous = {} if rerun_all else entry["results"]
+        stale = [ex for ex in examples if ex["hash"] not in previous]
+        print(f"\n🚦 {name}: running {len(stale)} of {len(examples)} example(s)", flush=True)
+        fresh = run(stale, entry["runner"], lambda result: print(render(result, name), flush=True))
+        by_hash = {**previous, **{ex["hash"]: r for ex, r in zip(stale, fresh)}}
+        entry["results"] = {ex["hash"]: by_hash[ex["hash"]] for ex in examples}
+        failed = sum(1 for r in entry["results"].values() if not r["passed"])
+        status = "✅" if not failed else "❌"
+        print(f"{status} {name}: {len(examples) - failed} passed, {failed} failed", flush=True)
+
+    dirs = []
+    for skill in skills:
+        skill_dir = Path(skill["examples"]).parent.parent
+        dirs += [skill_dir / "references", skill_dir / "scripts"]
+    watcher = make_watcher(dirs)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    try:
+        for name in state:
+            refresh(name)
+        print(f"\n👀 Watching {len(skills)} skill(s) ({kind}); Ctrl-C to stop", flush=True)
+        while True:
+            changed = watcher.wait()
+            for name, entry in state.items():
+                skill_dir = Path(entry["skill"]["examples"]).parent.parent.resolve()
+                touched = [p for p in changed if p.resolve().parent.parent == skill_dir]
+                if touched:
+                    refresh(name, rerun_all=any(p.suffix == ".py" for p in touched))
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+        for entry in state.values():
+            if entry["runner"] is not None:
+                entry["runner"].close()
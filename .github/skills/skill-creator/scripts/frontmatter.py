@@ -0,0 +1,145 @@
+"""
+SKILL.md frontmatter loader used by quick_validate.py
+
+Frontmatter only uses a tiny YAML subset: top-level `key: value` pairs with
+one-line plain or quoted strings, plus one nested level of `key: value` pairs
+(`metadata`) or `- item` lists (`allowed-tools`). parse_simple() reads exactly
+that subset without importing PyYAML. Anything else - block scalars, flow
+collections, anchors, tags, escapes, multi-line values, values YAML resolves
+to numbers, booleans, null or dates - goes to yaml.safe_load() itself, so
+load_frontmatter() matches it in results and in error messages. (libyaml's
+CSafeLoader is not used: it resolves some inputs differently, e.g. a bare
+`!` tag loads as '' instead of None.)
+"""
+
+import re
+
+# Top-level or nested `key:` with an optional value
+RE_KEY = re.compile(r"([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$")
+# Outside printable YAML or a line break other than "\n" (tabs, "\r", NEL,
+# U+2028/U+2029, BOM): left to PyYAML
+RE_UNSUPPORTED_CHAR = re.compile(
+    "[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]"
+)
+# Plain words YAML 1.1 resolves to booleans or null (checked case-insensitively)
+NON_STRING_WORDS = {"yes", "no", "true", "false", "on", "off", "null"}
+
+
+class FrontmatterError(ValueError):
+    """The frontmatter is not valid YAML; the message is PyYAML's."""
+
+
+class _Unsupported(Exception):
+    """Outside the subset read by parse_simple()."""
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _scalar(text):
+    """Value of a one-line string scalar."""
+    if text.startswith('"'):
+        inner = text[1:-1]
+        if len(text) < 2 or not text.endswith('"') or '"' in inner or "\\" in inner:
+            raise _Unsupported
+        return inner
+    if text.startswith("'"):
+        inner = text[1:-1]
+        if len(text) < 2 or not text.endswith("'") or "'" in inner.replace("''", ""):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    # A plain scalar starting with a letter is a string unless it is one of
+    # the boolean/null words; digits, signs and "." may be numbers or dates,
+    # and other first characters are YAML indicators
+    if (
+        not text[0].isalpha()
+        or text.lower() in NON_STRING_WORDS
+        or ": " in text
+        or " #" in text
+        or text.endswith(":")
+    ):
+        raise _Unsupported
+    return text
+
+
+def _key(match):
+    key = match.group(1)
+    if key.lower() in NON_STRING_WORDS:
+        raise _Unsupported
+    return key
+
+
+def _block(lines):
+    """Value of the indented lines under a `key:` without an inline value."""
+    items = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
+    if not items:
+        return None
+    indent = _indent(items[0])
+    if any(_indent(line) != indent for line in items):
+        raise _Unsupported
+    body = [line[indent:].rstrip(" ") for line in items]
+    if all(line.startswith("- ") for line in body):
+        return [_scalar(line[2:].strip()) for line in body]
+    mapping = {}
+    for line in body:
+        match = RE_KEY.match(line)
+        if not match or not (match.group(2) or "").strip():
+            raise _Unsupported
+        mapping[_key(match)] = _scalar(match.group(2).strip())
+    return mapping
+
+
+def parse_simple(text):
+    """
+    Parse frontmatter written in the subset described above.
+
+    Returns:
+        The frontmatter dict, or None if the text needs a full YAML parser
+    """
+    if RE_UNSUPPORTED_CHAR.search(text):
+        return None
+    lines = text.split("\n")
+    result = {}
+    i = 0
+    try:
+        while i < len(lines):
+            line = lines[i].rstrip(" ")
+            i += 1
+            if not line or line.startswith("#"):
+                continue
+            match = RE_KEY.match(line)
+            if not match:
+                return None
+            key = _key(match)
+            value = (match.group(2) or "").strip()
+            if value:
+                result[key] = _scalar(value)
+                continue
+            block = []
+            while i < len(lines) and (not lines[i].strip() or lines[i].startswith(" ")):
+                block.append(lines[i])
+                i += 1
+            result[key] = _block(block)
+    except _Unsupported:
+        return None
+    return result or None
+
+
+def load_frontmatter(text):
+    """
+    Parse frontmatter YAML like yaml.safe_load(), avoiding PyYAML when possible.
+
+    Raises:
+        FrontmatterError: If the text is not valid YAML
+    """
+    result = parse_simple(text)
+    if result is not None:
+        return result
+
+    import yaml
+
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(str(e)) from e
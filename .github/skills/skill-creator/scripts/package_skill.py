@@ -14,6 +14,36 @@ import sys
 import zipfile
 from pathlib import Path
 from quick_validate import validate_skill
+from skill_refs import check_references
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# Per-skill scripts/validate_examples.py wrappers load the shared validator from
+# the repo; archives get a copy of it in scripts/validator/ instead. Only the
+# modules of a plain run are bundled: --bench, --stress, --repeat, --profile,
+# --record/--replay and the --fork-server preloader import theirs on demand
+# and stay repository-only.
+WRAPPER_MARKER = "skill-creator/scripts/validate_examples.py"
+VALIDATOR_FILES = (
+    "validate_examples.py",
+    "example_index.py",
+    "example_reports.py",
+    "example_runners.py",
+    "result_cache.py",
+)
+
+
+def bundled_validator(skill_path):
+    """
+    Shared validator files to bundle with a skill whose validate_examples.py is a wrapper.
+
+    Returns:
+        List of (source path, archive name) pairs; empty if the skill has no wrapper
+    """
+    wrapper = skill_path / "scripts" / "validate_examples.py"
+    if not wrapper.is_file() or WRAPPER_MARKER not in wrapper.read_text(encoding="utf-8"):
+        return []
+    target = wrapper.parent.relative_to(skill_path.parent) / "validator"
+    return [(SCRIPTS_DIR / name, target / name) for name in VALIDATOR_FILES]
 
 
 def package_skill(skill_path, output_dir=None):
@@ -51,7 +81,12 @@ def package_skill(skill_path, output_dir=None):
         print(f"❌ Validation failed: {message}")
         print("   Please fix the validation errors before packaging.")
         return None
-    print(f"✅ {message}\n")
+    print(f"✅ {message}")
+    # Files no markdown mentions still end up in the archive
+    unused = check_references([skill_path])[skill_path]["unused"]
+    for rel in unused:
+        print(f"⚠️  Not mentioned in any markdown: {rel}")
+    print()
 
     # Determine output location
     skill_name = skill_path.name
@@ -68,11 +103,15 @@ def package_skill(skill_path, output_dir=None):
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
             # Walk through the skill directory
             for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
+                # Recorded runner snapshots are validation fixtures, not skill content
+                if file_path.is_file() and not file_path.name.endswith('.snapshots.json'):
                     # Calculate the relative path within the zip
                     arcname = file_path.relative_to(skill_path.parent)
                     zipf.write(file_path, arcname)
                     print(f"  Added: {arcname}")
+            for file_path, arcname in bundled_validator(skill_path):
+                zipf.write(file_path, arcname)
+                print(f"  Bundled: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
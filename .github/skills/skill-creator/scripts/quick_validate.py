@@ -1,14 +1,68 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory> [<skill_directory> ...] [--jobs N] [--no-refs]
+
+Example:
+    python quick_validate.py skills/humanize
+    python quick_validate.py 'skills/*'
+
+Arguments may be glob patterns; matches without a SKILL.md are ignored. Several
+skills are validated concurrently in one process and summarized in a single
+report; the exit code is 1 if any skill is invalid.
+
+Relative paths mentioned in the skills' markdown are resolved against one index
+of all their files (see skill_refs.py): a dangling link makes a skill invalid,
+while unresolved path mentions and files no markdown mentions are reported as
+warnings.
 """
 
+import argparse
+import glob
 import sys
 import os
 import re
-import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from frontmatter import FrontmatterError, load_frontmatter
+from skill_refs import check_references
+
+# Frontmatter is a few KB at most, while SKILL.md bodies can be much larger
+MAX_FRONTMATTER_CHARS = 64 * 1024
+
+def read_frontmatter(skill_md):
+    """
+    Read the frontmatter of SKILL.md up to its closing '---', not the body.
+
+    Finds the same text as matching `^---\\n(.*?)\\n---` against the whole file, but
+    reads no further than the closing delimiter or MAX_FRONTMATTER_CHARS.
+
+    Returns:
+        Tuple of (frontmatter text, None), or (None, error message)
+    """
+    with skill_md.open() as f:
+        first = f.readline(MAX_FRONTMATTER_CHARS)
+        if not first.startswith('---'):
+            return None, "No YAML frontmatter found"
+        if first != '---\n':
+            return None, "Invalid frontmatter format"
+        lines = []
+        size = 0
+        while True:
+            line = f.readline(MAX_FRONTMATTER_CHARS - size + 1)
+            if not line:
+                return None, "Invalid frontmatter format"
+            # The line right after the opening '---' cannot close the block
+            if lines and line.startswith('---'):
+                return ''.join(lines)[:-1], None
+            lines.append(line)
+            size += len(line)
+            if size > MAX_FRONTMATTER_CHARS:
+                return None, f"Frontmatter is not closed within {MAX_FRONTMATTER_CHARS} characters"
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
@@ -18,24 +72,17 @@ def validate_skill(skill_path):
     if not skill_md.exists():
         return False, "SKILL.md not found"
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
-
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
+    # Read and extract frontmatter, without loading the body
+    frontmatter_text, error = read_frontmatter(skill_md)
+    if error:
+        return False, error
 
-    frontmatter_text = match.group(1)
-
-    # Parse YAML frontmatter
+    # Parse YAML frontmatter (PyYAML is only imported for unusual frontmatter)
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = load_frontmatter(frontmatter_text)
         if not isinstance(frontmatter, dict):
             return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
+    except FrontmatterError as e:
         return False, f"Invalid YAML in frontmatter: {e}"
 
     # Define allowed properties
@@ -85,11 +132,96 @@ def validate_skill(skill_path):
 
     return True, "Skill is valid!"
 
+def expand_skill_paths(patterns):
+    """Expand skill directories and glob patterns, in order and without duplicates"""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            paths.extend(Path(m) for m in matches if (Path(m) / 'SKILL.md').is_file())
+        else:
+            paths.append(Path(pattern))
+    return list(dict.fromkeys(paths))
+
+def validate_skills(skill_paths, jobs=None):
+    """
+    Validate many skills concurrently.
+
+    Returns:
+        List of dicts with `skill` (path string), `valid` and `message`, in
+        input order
+    """
+    def check(path):
+        try:
+            valid, message = validate_skill(path)
+        except (OSError, UnicodeDecodeError) as e:
+            valid, message = False, f"Cannot read SKILL.md: {e}"
+        return {'skill': str(path), 'valid': valid, 'message': message}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(check, skill_paths))
+
+def add_reference_checks(results):
+    """
+    Resolve the relative paths mentioned in the markdown of all skills at once.
+
+    A skill with dangling links becomes invalid; path mentions that do not
+    resolve and files no markdown mentions are attached as `warnings`.
+    """
+    problems = check_references(Path(r['skill']) for r in results if Path(r['skill']).is_dir())
+    for result in results:
+        found = problems.get(Path(result['skill']),
+                             {'dangling': [], 'unresolved': [], 'unused': []})
+        result['warnings'] = [f"Unresolved path: {source}:{line}: {path} ({reason})"
+                              for source, line, path, reason in found['unresolved']]
+        result['warnings'] += [f"Unused file (not mentioned in any markdown): {rel}"
+                               for rel in found['unused']]
+        if found['dangling'] and result['valid']:
+            result['valid'] = False
+            result['message'] = "Dangling link(s): " + "; ".join(
+                f"{source}:{line}: {path} ({reason})"
+                for source, line, path, reason in found['dangling'])
+    return results
+
+def print_report(results):
+    """Print one line per skill and a summary. Returns the number of invalid skills."""
+    invalid = 0
+    for result in results:
+        if not result['valid']:
+            invalid += 1
+        mark = '✅' if result['valid'] else '❌'
+        print(f"{mark} {result['skill']}: {result['message']}")
+        for warning in result.get('warnings', []):
+            print(f"   ⚠️  {warning}")
+    print(f"\n{len(results) - invalid} valid, {invalid} invalid, {len(results)} total")
+    return invalid
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
+    parser = argparse.ArgumentParser(description="Validate skill frontmatter and naming")
+    parser.add_argument('skills', nargs='+', help="Skill directories or glob patterns")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Worker threads (default: Python's ThreadPoolExecutor default)")
+    parser.add_argument('--no-refs', action='store_true',
+                        help="Skip checking the paths mentioned in markdown")
+    args = parser.parse_args()
+
+    skill_paths = expand_skill_paths(args.skills)
+    if len(args.skills) == 1 and skill_paths == [Path(args.skills[0])]:
+        # A single directory keeps the plain one-line output
+        valid, message = validate_skill(skill_paths[0])
+        result = {'skill': args.skills[0], 'valid': valid, 'message': message}
+        if not args.no_refs:
+            add_reference_checks([result])
+        print(result['message'])
+        for warning in result.get('warnings', []):
+            print(f"⚠️  {warning}")
+        sys.exit(0 if result['valid'] else 1)
+    if not skill_paths:
+        print("No skills matched")
         sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+
+    results = validate_skills(skill_paths, jobs=args.jobs)
+    if not args.no_refs:
+        add_reference_checks(results)
+    invalid = print_report(results)
+    sys.exit(1 if invalid else 0)
\ No newline at end of file
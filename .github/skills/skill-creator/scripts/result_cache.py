@@ -0,0 +1,126 @@
+"""
+On-disk cache of passing example results used by validate_examples.py
+
+An entry is keyed by a SHA-256 over the example input, the expected output,
+the runner command, the content of the runner's source files and the
+comparison mode, so editing any of them re-runs the example. Only passing
+results are stored. Entries are small JSON files sharded by key prefix; prune()
+evicts the least recently used ones once the cache exceeds its size bound.
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import tempfile
+from pathlib import Path
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Larger files (typically interpreter binaries) are fingerprinted by size only
+MAX_HASHED_FILE_BYTES = 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "copilot-skills" / "validate_examples"
+
+
+def runner_source_files(runner_spec):
+    """Return the existing files named by a runner command or `module.py:func` spec."""
+    if ":" in runner_spec and Path(runner_spec.rpartition(":")[0]).is_file():
+        return [Path(runner_spec.rpartition(":")[0])]
+    try:
+        tokens = shlex.split(runner_spec)
+    except ValueError:
+        tokens = runner_spec.split()
+    return [Path(tok) for tok in tokens if Path(tok).is_file()]
+
+
+def fingerprint_file(path):
+    size = path.stat().st_size
+    if size > MAX_HASHED_FILE_BYTES:
+        return f"size:{size}"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-hash cache for one runner.
+
+    Args:
+        cache_dir: Directory holding the entries
+        runner_spec: Runner command or `module.py:func` spec
+        max_bytes: Size bound enforced by prune()
+    """
+
+    def __init__(self, cache_dir, runner_spec, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        sources = sorted(
+            (str(p), fingerprint_file(p)) for p in runner_source_files(runner_spec)
+        )
+        self.runner_fingerprint = [runner_spec, sources]
+
+    def key(self, example, fuzzy=False):
+        payload = json.dumps(
+            [
+                CACHE_VERSION,
+                example["input"],
+                example["expected"],
+                self.runner_fingerprint,
+                "fuzzy" if fuzzy else "normalized",
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached entry dict, or None on a miss."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key, result):
+        path = self._path(key)
+        entry = {"stdout": result["stdout"], "stderr": result["stderr"]}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent validators never see partial entries
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits max_bytes."""
+        prune_cache(self.cache_dir, self.max_bytes)
+
+
+def prune_cache(cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+    entries = []
+    total = 0
+    for path in [*Path(cache_dir).glob("*/*.json"), *Path(cache_dir).glob("*/*.jsonl")]:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
@@ -0,0 +1,87 @@
+"""
+Fork server started by example_runners.ForkServerRunner
+
+Usage:
+    python runner_fork_server.py <socket-fd> <runner-script> [args...]
+
+Runs under the runner's own interpreter. The runner script is compiled and
+executed once (with __name__ set to "__fork_preload__", so only its imports
+and definitions run), then every "run" request received on the socket forks a
+child that executes the script as __main__ on the stdin/stdout/stderr file
+descriptors passed with the request. The server answers each request with
+`pid <pid>` once the child exists and `exit <code>` once it has been reaped;
+a script that fails to load is reported as `error <message>`.
+"""
+
+import os
+import socket
+import sys
+import traceback
+import types
+
+
+def run_child(code, script, argv, fds):
+    os.setsid()
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    sys.argv = argv
+    module = types.ModuleType("__main__")
+    module.__file__ = script
+    sys.modules["__main__"] = module
+    status = 0
+    try:
+        exec(code, module.__dict__)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+    os._exit(status)
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    script = os.path.abspath(sys.argv[2])
+    argv = sys.argv[2:]
+    # Import the runner's siblings as `python script.py` would
+    sys.path[0] = os.path.dirname(script)
+
+    try:
+        with open(script, "rb") as f:
+            code = compile(f.read(), script, "exec")
+        exec(code, {"__name__": "__fork_preload__", "__file__": script})
+    except BaseException as e:
+        sock.sendall(f"error {type(e).__name__}: {e}\n".encode("utf-8"))
+        return
+    sock.sendall(b"ready\n")
+
+    while True:
+        msg, fds, _, _ = socket.recv_fds(sock, 16, 3)
+        if not msg:
+            break
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            run_child(code, script, argv, fds)
+        for fd in fds:
+            os.close(fd)
+        sock.sendall(f"pid {pid}\n".encode("utf-8"))
+        _, status = os.waitpid(pid, 0)
+        sock.sendall(f"exit {os.waitstatus_to_exitcode(status)}\n".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Skill Cost - Estimates the context tokens a skill costs and enforces budgets
+
+Usage:
+    python skill_cost.py <skill_directory|glob> [...] [--description-budget N]
+                         [--body-budget N] [--reference-budget N] [--top N] [--json PATH]
+
+Example:
+    python skill_cost.py skills/cpp-modernize
+    python skill_cost.py 'skills/*' --body-budget 3000 --json skill-cost.json
+
+A skill costs context in three tiers: its description is always loaded, the
+SKILL.md body when the skill triggers, and files under references/ when the
+agent reads them. Token counts are estimated offline (no tokenizer download):
+text is split the way BPE tokenizers pre-split it - words, digit groups,
+punctuation runs, whitespace - and each piece is charged by length. This comes
+to roughly 4 characters per token on English prose and fewer on code; treat
+counts as estimates for budgeting, not exact tokenizer output.
+
+Markdown files are split into sections at `#` and `##` headings (outside code
+fences). The heaviest SKILL.md body sections are listed as candidates to move
+into references/. Exit code: 0 if every skill is within budget, 1 otherwise.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from frontmatter import FrontmatterError, load_frontmatter
+from quick_validate import expand_skill_paths, read_frontmatter
+
+# Token budgets (roughly 0.75 words per token): ~150 tokens (~110 words) of
+# description, a SKILL.md body under 5k tokens (~3.8k words) and reference
+# files under 10k tokens (~7.5k words)
+DEFAULT_DESCRIPTION_BUDGET = 150
+DEFAULT_BODY_BUDGET = 5000
+DEFAULT_REFERENCE_BUDGET = 10000
+DEFAULT_TOP = 5
+
+RE_PIECE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\W\d_]+|\s+|(?:[^\w\s]|_)+")
+RE_HEADING = re.compile(r"(#{1,2})\s+(.*?)\s*#*\s*$")
+RE_FENCE = re.compile(r"\s*(```|~~~)")
+RE_FRONTMATTER_BLOCK = re.compile(r"---\n.*?\n---[^\n]*\n?", re.DOTALL)
+
+
+def estimate_tokens(text):
+    """Approximate BPE token count of a text."""
+    tokens = 0
+    for piece in RE_PIECE.findall(text):
+        first = piece[0]
+        if first.isspace():
+            # A single space is absorbed by the following word
+            tokens += 0 if piece == " " else 1
+        elif first.isascii() and first.isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif first.isdigit():
+            tokens += 1
+        elif first.isalpha():
+            # Non-Latin scripts split into short pieces
+            tokens += (len(piece) + 1) // 2
+        else:
+            tokens += (len(piece) + 1) // 2
+    return tokens
+
+
+def split_sections(text):
+    """
+    Split markdown at `#` / `##` headings outside code fences.
+
+    Returns:
+        List of (title, text) pairs; text before the first heading is titled
+        "(preamble)"
+    """
+    sections = []
+    title = "(preamble)"
+    lines = []
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if RE_FENCE.match(line):
+            in_fence = not in_fence
+        heading = None if in_fence else RE_HEADING.match(line)
+        if heading:
+            if lines and "".join(lines).strip():
+                sections.append((title, "".join(lines)))
+            title = f"{heading.group(1)} {heading.group(2)}"
+            lines = []
+        lines.append(line)
+    if lines and "".join(lines).strip():
+        sections.append((title, "".join(lines)))
+    return sections
+
+
+def file_cost(path, text):
+    sections = [
+        {"title": title, "tokens": estimate_tokens(body)}
+        for title, body in (split_sections(text) if path.suffix == ".md" else [])
+    ]
+    return {"path": path.as_posix(), "tokens": estimate_tokens(text), "sections": sections}
+
+
+def skill_cost(skill_path):
+    """
+    Estimate the token cost of one skill.
+
+    Returns:
+        Dict with `skill`, `description` (tokens), `body` (file cost of the
+        SKILL.md body) and `references` (file costs of the readable files
+        under references/)
+
+    Raises:
+        ValueError: If SKILL.md is missing or its frontmatter cannot be read
+    """
+    skill_path = Path(skill_path)
+    skill_md = skill_path / "SKILL.md"
+    if not skill_md.is_file():
+        raise ValueError("SKILL.md not found")
+    frontmatter_text, error = read_frontmatter(skill_md)
+    if error:
+        raise ValueError(error)
+    try:
+        frontmatter = load_frontmatter(frontmatter_text)
+    except FrontmatterError as e:
+        raise ValueError(f"Invalid YAML in frontmatter: {e}")
+    description = frontmatter.get("description") if isinstance(frontmatter, dict) else None
+
+    content = skill_md.read_text(encoding="utf-8")
+    body = RE_FRONTMATTER_BLOCK.sub("", content, count=1)
+    references = []
+    for path in sorted((skill_path / "references").rglob("*")):
+        if not path.is_file():
+            continue
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (UnicodeDecodeError, OSError):
+            # Binary assets are not read into context
+            continue
+        references.append(file_cost(path.relative_to(skill_path), text))
+    return {
+        "skill": str(skill_path),
+        "description": estimate_tokens(description) if isinstance(description, str) else 0,
+        "body": file_cost(Path("SKILL.md"), body),
+        "references": references,
+    }
+
+
+def budget_violations(cost, description_budget, body_budget, reference_budget):
+    """Return human-readable budget violations of a skill_cost() result."""
+    violations = []
+    if cost["description"] > description_budget:
+        violations.append(
+            f"description: {cost['description']} tokens exceeds budget {description_budget}"
+        )
+    if cost["body"]["tokens"] > body_budget:
+        violations.append(
+            f"SKILL.md body: {cost['body']['tokens']} tokens exceeds budget {body_budget}"
+        )
+    for ref in cost["references"]:
+        if ref["tokens"] > reference_budget:
+            violations.append(
+                f"{ref['path']}: {ref['tokens']} tokens exceeds budget {reference_budget}"
+            )
+    return violations
+
+
+def format_cost(cost, violations, top=DEFAULT_TOP):
+    references = sum(ref["tokens"] for ref in cost["references"])
+    lines = [
+        f"{'❌' if violations else '✅'} {cost['skill']}: description {cost['description']}, "
+        f"body {cost['body']['tokens']}, references {references} tokens"
+    ]
+    for ref in cost["references"]:
+        lines.append(f"  {ref['tokens']:>8}  {ref['path']}")
+    heaviest = sorted(cost["body"]["sections"], key=lambda s: s["tokens"], reverse=True)[:top]
+    if heaviest:
+        lines.append("  Heaviest SKILL.md sections (candidates for references/):")
+        lines.extend(f"  {s['tokens']:>8}  {s['title']}" for s in heaviest)
+    lines.extend(f"  ❌ {violation}" for violation in violations)
+    return "\n".join(lines)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Estimate the context-token cost of skills")
+    p.add_argument("skills", nargs="+", help="Skill directories or glob patterns")
+    p.add_argument(
+        "--description-budget",
+        type=int,
+        default=DEFAULT_DESCRIPTION_BUDGET,
+        metavar="N",
+        help="Tokens allowed for the description (default: %(default)s)",
+    )
+    p.add_argument(
+        "--body-budget",
+        type=int,
+        default=DEFAULT_BODY_BUDGET,
+        metavar="N",
+        help="Tokens allowed for the SKILL.md body (default: %(default)s)",
+    )
+    p.add_argument(
+        "--reference-budget",
+        type=int,
+        default=DEFAULT_REFERENCE_BUDGET,
+        metavar="N",
+        help="Tokens allowed per file under references/ (default: %(default)s)",
+    )
+    p.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="N",
+        help="Heaviest SKILL.md sections to list (default: %(default)s)",
+    )
+    p.add_argument("--json", metavar="PATH", help="Write per-skill, per-file and per-section costs")
+    args = p.parse_args()
+
+    skill_paths = expand_skill_paths(args.skills)
+    if not skill_paths:
+        print("No skills matched")
+        sys.exit(1)
+
+    report = []
+    failing = 0
+    for skill_path in skill_paths:
+        try:
+            cost = skill_cost(skill_path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            failing += 1
+            print(f"❌ {skill_path}: {e}")
+            continue
+        violations = budget_violations(
+            cost, args.description_budget, args.body_budget, args.reference_budget
+        )
+        if violations:
+            failing += 1
+        report.append({**cost, "violations": violations})
+        print(format_cost(cost, violations, top=args.top))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    print(f"\n{len(skill_paths) - failing} within budget, {failing} over budget or unreadable")
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
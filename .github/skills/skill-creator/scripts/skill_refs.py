@@ -0,0 +1,199 @@
+"""
+Cross-reference index of skill files used by quick_validate.py
+
+One pass over the catalog lists every file of every skill and collects every
+relative path its markdown mentions:
+
+- link and image targets, `[text](references/guide.md)`, and reference-style
+  link definitions, `[1]: references/guide.md`; targets are percent-decoded
+- code spans that look like a file path: `scripts/run.py`, `c_api.h`
+- plain-text paths under a resource directory: references/workflows.md, also
+  inside fenced code blocks (commands such as `python scripts/run.py`)
+
+A mention is resolved against the directory of the mentioning file, then the
+skill root; a bare file name also matches a file of that name anywhere in the
+skill. Resolution uses the index only, without touching the filesystem again.
+Link and image targets that match nothing, or that leave the skill (a
+packaged `.skill` only holds its own directory), are dangling. Code spans and
+plain-text paths that do not resolve are only unresolved: prose often names
+files of the user's project (`src/app/main.py`) or illustrates a layout.
+Unresolved bare file names, such as `package.json`, are not reported at all.
+
+Files that no markdown mentions are unused: they are dead weight in the
+`.skill` zip, or a mention is missing. SKILL.md, licenses and recorded runner
+snapshots are never unused, and a mentioned directory below the top level
+(`assets/template/`, not `assets/`) covers the files in it.
+"""
+
+import os
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+# Link and image targets, optionally <bracketed> and followed by a title
+RE_LINK = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?[^)]*\)")
+# Reference-style link definitions; `[^1]:` footnotes are not links
+RE_LINK_DEFINITION = re.compile(r" {0,3}\[(?!\^)[^\]]+\]:\s*<?([^\s>]+)>?.*")
+RE_CODE_SPAN = re.compile(r"`([^`\s]+)`")
+RE_RESOURCE_PATH = re.compile(r"(?<![\w./-])((?:scripts|references|assets)/[\w-][\w./-]*)")
+RE_FENCE = re.compile(r"\s*(```|~~~)")
+RE_PATH_LIKE = re.compile(r"(?:\.\.?/)*[\w-][\w.-]*(?:/[\w.-]+)*/?")
+RE_EXTENSION = re.compile(r"\.[A-Za-z][A-Za-z0-9]{0,4}$")
+RESOURCE_DIRS = ("scripts/", "references/", "assets/")
+
+
+def _looks_like_path(text):
+    """A relative path with a file extension, a trailing "/" or a resource directory."""
+    return bool(RE_PATH_LIKE.fullmatch(text)) and (
+        bool(RE_EXTENSION.search(text)) or text.endswith("/") or text.startswith(RESOURCE_DIRS)
+    )
+
+
+def _link_target(target):
+    """Relative path of a link target, or None for URLs, anchors and absolute paths."""
+    if "://" in target or target.startswith(("#", "/", "mailto:")):
+        return None
+    return unquote(target.split("#", 1)[0].split("?", 1)[0]) or None
+
+
+def _always_used(rel):
+    name = posixpath.basename(rel)
+    return rel == "SKILL.md" or name.startswith("LICENSE") or name.endswith(".snapshots.json")
+
+
+def find_mentions(text):
+    """
+    Find the relative paths mentioned in markdown.
+
+    Returns:
+        List of (line number, path, linked) tuples in text order; linked is
+        True for link and image targets and link definitions
+    """
+    mentions = []
+    in_fence = False
+    for number, line in enumerate(text.splitlines(), 1):
+        if RE_FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        found = {}
+        if not in_fence:
+            definition = RE_LINK_DEFINITION.fullmatch(line)
+            targets = [definition] if definition else list(RE_LINK.finditer(line))
+            for m in targets:
+                found[_link_target(m.group(1))] = True
+            # The raw target of a link is not mentioned again as plain text
+            line = "" if definition else RE_LINK.sub(" ", line)
+            for m in RE_CODE_SPAN.finditer(line):
+                found.setdefault(m.group(1), False)
+        for m in RE_RESOURCE_PATH.finditer(line):
+            found.setdefault(m.group(1).rstrip("."), False)
+        for path, linked in found.items():
+            if path and (linked or _looks_like_path(path)):
+                mentions.append((number, path, linked))
+    return mentions
+
+
+def build_index(skill_paths):
+    """
+    Index the files and markdown mentions of skills.
+
+    Args:
+        skill_paths: Skill directories
+
+    Returns:
+        Dict with `files` (skill path -> set of file paths relative to the
+        skill, POSIX style) and `mentions` (list of (skill path, source file,
+        line, mentioned path, linked))
+    """
+    files = {}
+    mentions = []
+    for skill_path in skill_paths:
+        skill_path = Path(skill_path)
+        skill_files = set()
+        for root, dirs, names in os.walk(skill_path):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__" and not d.startswith("."))
+            rel_root = Path(root).relative_to(skill_path)
+            for name in sorted(names):
+                rel = (rel_root / name).as_posix()
+                skill_files.add(rel)
+                if name.endswith(".md"):
+                    try:
+                        text = (Path(root) / name).read_text(encoding="utf-8")
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    mentions.extend(
+                        (skill_path, rel, *mention) for mention in find_mentions(text)
+                    )
+        files[skill_path] = skill_files
+    return {"files": files, "mentions": mentions}
+
+
+def _resolve(skill_files, dirs, source, path):
+    """Resolve a mention to a file or directory of the skill, or None."""
+    for base in dict.fromkeys([posixpath.dirname(source), ""]):
+        candidate = posixpath.normpath(posixpath.join(base, path.rstrip("/")))
+        if candidate in skill_files or candidate in dirs:
+            return candidate
+    if "/" not in path:
+        for rel in sorted(skill_files):
+            if posixpath.basename(rel) == path:
+                return rel
+    return None
+
+
+def _dangling_reason(index, skill_path, source, path):
+    target = os.path.normpath(skill_path / posixpath.dirname(source) / path)
+    for other, other_files in index["files"].items():
+        rel = Path(os.path.relpath(target, other)).as_posix()
+        if other != skill_path and (rel in other_files or rel == "."):
+            return f"points into skill '{other.name}', which is packaged separately"
+    if os.path.relpath(target, skill_path).startswith(".."):
+        return "points outside the skill"
+    return "not found"
+
+
+def resolve_references(index):
+    """
+    Resolve every mention of an index built by build_index().
+
+    Returns:
+        Dict of skill path -> {"dangling": [(source, line, path, reason)],
+        "unresolved": [(source, line, path, reason)], "unused": [file paths]}
+    """
+    problems = {}
+    used = {}
+    dirs = {}
+    for skill_path, skill_files in index["files"].items():
+        problems[skill_path] = {"dangling": [], "unresolved": [], "unused": []}
+        used[skill_path] = {rel for rel in skill_files if _always_used(rel)}
+        dirs[skill_path] = {
+            parent.as_posix()
+            for rel in skill_files
+            for parent in Path(rel).parents
+            if parent != Path(".")
+        }
+    for skill_path, source, line, path, linked in index["mentions"]:
+        skill_files = index["files"][skill_path]
+        target = _resolve(skill_files, dirs[skill_path], source, path)
+        if target in skill_files:
+            used[skill_path].add(target)
+        elif target is not None:
+            # Mentioning a top-level directory such as references/ does not
+            # make its files used
+            if "/" in target:
+                used[skill_path].update(
+                    rel for rel in skill_files if rel.startswith(target + "/")
+                )
+        elif linked or "/" in path:
+            reason = _dangling_reason(index, skill_path, source, path)
+            kind = "dangling" if linked else "unresolved"
+            problems[skill_path][kind].append((source, line, path, reason))
+    for skill_path, skill_files in index["files"].items():
+        problems[skill_path]["unused"] = sorted(skill_files - used[skill_path])
+    return problems
+
+
+def check_references(skill_paths):
+    """Build the index of skill_paths and resolve it; see resolve_references()."""
+    return resolve_references(build_index(skill_paths))
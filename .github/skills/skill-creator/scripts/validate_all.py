@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Catalog Validator - Runs every skill's examples in parallel and prints one summary
+
+Usage:
+    python validate_all.py [skills-directory] [--jobs N] [--timeout SECONDS] [--fuzzy]
+                           [--persistent | --fork-server]
+
+Example:
+    python validate_all.py skills
+    python validate_all.py skills --jobs 8
+    python validate_all.py skills --shard 2/4 --timings validation-report.json
+    python validate_all.py skills --shard 1/2 --timings timings.json --timings-out shard-1.json
+    python validate_all.py skills --changed-since origin/main
+    python validate_all.py skills --watch
+
+Discovers every `<skill>/references/examples.md` that has a matching
+`<skill>/scripts/mock_runner.py`, fans all examples of all skills out over a
+process pool (one worker per core by default) and reports results grouped by
+skill, followed by an aggregated pass/fail table. With --persistent each worker
+keeps one `--serve` runner per skill alive instead of spawning per example; with
+--fork-server each worker keeps one preloaded interpreter per skill and forks it
+per example.
+Passing results and parsed examples files are cached exactly as in
+validate_examples.py (--no-cache to disable), so skills untouched by a change
+are neither re-parsed nor re-executed.
+
+--shard INDEX/COUNT (1-based) runs a deterministic slice of all examples of all
+skills, so a CI matrix of COUNT nodes covers the catalog exactly once. When
+--timings points at earlier --json-report files, shards are balanced by the
+recorded per-example durations; otherwise by example count. --timings-out
+writes the durations of the examples of this run (of this shard): measured
+ones, and the --timings duration for cached results, which do not execute.
+Merging the files of all shards over the previous timings gives the next run's
+--timings.
+
+--changed-since REF limits the run to skills changed since REF, as selected by
+changed_skills.py (every skill when the shared tooling changed).
+
+--fail-fast cancels the examples that have not started once one fails (the few
+already handed to a worker still finish within --timeout), and --budget SECONDS
+caps the whole run: no runner is allowed past the deadline and later examples
+are skipped. Skipped examples make the run fail.
+
+--record stores each skill's real runner output for inputs that have no
+snapshot yet in `references/examples.snapshots.json`, and --replay validates
+every skill against those snapshots without starting any runner (see
+example_snapshots.py).
+
+--profile runs every runner under cProfile and writes one merged
+`<skill>.pstats` per skill to --profile-dir, with a hot-function table each
+(see example_profile.py).
+
+--watch validates once and then keeps watching every skill's examples.md and
+runner scripts (see example_watch.py), re-running only changed examples on a
+warm persistent runner after each save.
+
+Exit code: 0 if all tests pass, 2 if any test fails or is skipped, or an
+examples file is invalid.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import sys
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from changed_skills import select_skills
+from example_profile import ProfilingRunner, merge_stats
+from example_runners import DEFAULT_MAX_OUTPUT_BYTES
+from example_snapshots import SnapshotRunner, SnapshotStore, record_results, snapshot_path
+from example_watch import watch_skills
+from result_cache import default_cache_dir, prune_cache
+from validate_examples import (
+    STOPPED_BY_FAIL_FAST,
+    add_cache_arguments,
+    add_diff_arguments,
+    add_limit_arguments,
+    add_output_arguments,
+    add_profile_arguments,
+    add_report_arguments,
+    add_snapshot_arguments,
+    cache_from_args,
+    check_example,
+    deadline_from_args,
+    formatter_from_args,
+    index_from_args,
+    load_examples,
+    make_runner,
+    print_profile,
+    report_from_args,
+    run_examples,
+    skipped_result,
+)
+
+# Warm runner backends owned by the current worker process, keyed by command,
+# snapshot mode and profile directory. Serving runners and fork servers exit on
+# their own once the worker dies and their stdin or socket reaches EOF.
+_worker_runners = {}
+
+
+def _check_in_worker(
+    example, cmd, runner_options, timeout, fuzzy, cache, deadline, snapshots, profile_dir
+):
+    key = (cmd, snapshots, profile_dir)
+    runner = _worker_runners.get(key)
+    if runner is None:
+        if snapshots and snapshots[1] == "replay":
+            runner = SnapshotRunner(SnapshotStore(snapshots[0]))
+        elif profile_dir:
+            runner = ProfilingRunner(
+                cmd, max_output_bytes=runner_options["max_output_bytes"], stats_dir=profile_dir
+            )
+        else:
+            runner = make_runner(cmd, **runner_options)
+            if snapshots:
+                runner = SnapshotRunner(SnapshotStore(snapshots[0]), runner)
+        if any(key[1:]) or runner_options["persistent"] or runner_options["fork_server"]:
+            _worker_runners[key] = runner
+    return check_example(
+        example, runner, timeout=timeout, fuzzy=fuzzy, cache=cache, deadline=deadline
+    )
+
+
+def discover_skills(skills_root):
+    """
+    Find skills that ship examples and a mock runner.
+
+    Args:
+        skills_root: Directory containing one sub-directory per skill
+
+    Returns:
+        Tuple of (skills, skipped): skills is a sorted list of dicts with
+        `name`, `examples` and `runner`; skipped lists skill names that have
+        examples but no mock runner
+    """
+    skills = []
+    skipped = []
+    for skill_dir in sorted(Path(skills_root).iterdir()):
+        examples = skill_dir / "references" / "examples.md"
+        if not examples.is_file():
+            continue
+        runner_script = skill_dir / "scripts" / "mock_runner.py"
+        if not runner_script.is_file():
+            skipped.append(skill_dir.name)
+            continue
+        skills.append({
+            "name": skill_dir.name,
+            "examples": examples,
+            "runner": shlex.join([sys.executable, str(runner_script)]),
+        })
+    return skills, skipped
+
+
+def parse_shard(value):
+    """Parse `INDEX/COUNT` (1-based) for argparse."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 1..COUNT, got '{value}'")
+    return index, count
+
+
+def load_timings(paths):
+    """
+    Read per-example durations from JSON reports written with --json-report.
+
+    Returns:
+        Dict mapping (skill name, example id) to seconds; cached results are skipped
+    """
+    timings = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        timings.update(timings_from_suites(report.get("suites", [])))
+    return timings
+
+
+def timings_from_suites(suites):
+    """Per-example durations of suites; cached and skipped results are ignored."""
+    timings = {}
+    for suite in suites:
+        for r in suite.get("results", []):
+            if r.get("duration") and not r.get("cached") and not r.get("skipped"):
+                timings[(suite["name"], r["id"])] = r["duration"]
+    return timings
+
+
+def save_timings(path, timings, reports):
+    """
+    Write the durations of the examples run, falling back to timings for
+    cached results, in the --json-report layout that load_timings() reads.
+    """
+    suites = [
+        {"name": name, "results": results}
+        for name, results in reports.items()
+        if isinstance(results, list)
+    ]
+    ran = {(suite["name"], r["id"]) for suite in suites for r in suite["results"]}
+    merged = {key: duration for key, duration in timings.items() if key in ran}
+    merged.update(timings_from_suites(suites))
+    suites = {}
+    for (name, example_id), duration in sorted(merged.items()):
+        suites.setdefault(name, []).append({"id": example_id, "duration": duration})
+    data = {"suites": [{"name": name, "results": results} for name, results in suites.items()]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def shard_examples(items, index, count, timings=None):
+    """
+    Deterministically pick the examples that belong to one shard.
+
+    Examples are assigned longest-first to the least loaded shard, weighted by
+    their recorded duration (unknown ones get the median of the known
+    durations). Ties are broken by (skill, id), so every node computes the same
+    partition from the same inputs.
+
+    Args:
+        items: List of (skill name, example dict) pairs
+        index: 1-based shard index
+        count: Number of shards
+        timings: Optional dict from load_timings()
+
+    Returns:
+        The subset of items for this shard, in their original order
+    """
+    timings = timings or {}
+    keys = [(name, ex["id"]) for name, ex in items]
+    known = sorted(timings[key] for key in keys if key in timings)
+    default = known[len(known) // 2] if known else 1.0
+    weight = {key: timings.get(key, default) for key in keys}
+
+    loads = [0.0] * count
+    chosen = set()
+    for key in sorted(keys, key=lambda key: (-weight[key], key)):
+        target = min(range(count), key=lambda i: (loads[i], i))
+        loads[target] += weight[key]
+        if target == index - 1:
+            chosen.add(key)
+    return [item for item, key in zip(items, keys) if key in chosen]
+
+
+def validate_all(
+    skills,
+    jobs=None,
+    timeout=10,
+    fuzzy=False,
+    persistent=False,
+    fork_server=False,
+    make_cache=None,
+    shard=None,
+    timings=None,
+    fail_fast=False,
+    deadline=None,
+    max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES,
+    index=None,
+    snapshot_mode=None,
+    profile=None,
+):
+    """
+    Run every example of every skill across a process pool.
+
+    Args:
+        skills: Skill dicts as returned by discover_skills()
+        jobs: Number of worker processes (defaults to the CPU count)
+        timeout: Per-example timeout in seconds
+        fuzzy: Ignore repeated whitespace when comparing
+        persistent: Reuse one `--serve` runner per skill in each worker
+        fork_server: Reuse one preloaded fork server per skill in each worker
+        make_cache: Optional callable mapping a runner command to a ResultCache
+        shard: Optional (index, count) tuple selecting a slice of all examples
+        timings: Optional dict from load_timings() used to balance shards
+        fail_fast: Cancel examples that have not started once one fails
+        deadline: Optional absolute time.time() value ending the run
+        max_output_bytes: Kill a runner whose stdout or stderr exceeds this
+        index: Optional ExampleIndex so unchanged examples files are not re-parsed
+        snapshot_mode: "record" to store runner output missing from each skill's
+            snapshot store, "replay" to answer from the stores only, or None
+        profile: Optional callable (merged pstats.Stats or None, skill name,
+            number of profiled runs) called per skill after running it under
+            cProfile
+
+    Returns:
+        Dict mapping skill name to either a list of result dicts (in example
+        order) or an error string if the examples file could not be parsed
+    """
+    reports = {}
+    items = []
+    snapshots = {}
+    for skill in skills:
+        try:
+            examples = load_examples(skill["examples"], index)
+        except ValueError as e:
+            reports[skill["name"]] = f"Error parsing examples: {e}"
+            continue
+        if snapshot_mode:
+            try:
+                store = SnapshotStore(snapshot_path(skill["examples"]))
+            except ValueError as e:
+                reports[skill["name"]] = f"Error loading snapshots: {e}"
+                continue
+            snapshots[skill["name"]] = (store, examples)
+        if not shard:
+            reports[skill["name"]] = []
+        items.extend((skill["name"], ex) for ex in examples)
+    if shard:
+        items = shard_examples(items, shard[0], shard[1], timings)
+
+    by_name = {skill["name"]: skill for skill in skills}
+    ran = {}
+    profile_dirs = {}
+    if profile:
+        profile_dirs = {name: tempfile.mkdtemp(prefix=f"{name}-profile-") for name in by_name}
+    runner_options = {
+        "persistent": persistent,
+        "fork_server": fork_server,
+        "max_output_bytes": max_output_bytes,
+    }
+    caches = {}
+    pending = []
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for name, ex in items:
+            skill = by_name[name]
+            if make_cache and name not in caches:
+                caches[name] = make_cache(skill["runner"])
+            future = pool.submit(
+                _check_in_worker,
+                ex,
+                skill["runner"],
+                runner_options,
+                timeout,
+                fuzzy,
+                caches.get(name),
+                deadline,
+                (str(snapshots[name][0].path), snapshot_mode) if snapshot_mode else None,
+                profile_dirs.get(name),
+            )
+            pending.append((name, ex, future))
+        if fail_fast:
+            _cancel_after_first_failure([future for _, _, future in pending])
+        for name, ex, future in pending:
+            if future.cancelled():
+                result = skipped_result(ex, STOPPED_BY_FAIL_FAST)
+            else:
+                result = future.result()
+            reports.setdefault(name, []).append(result)
+            ran.setdefault(name, []).append(ex)
+
+    if snapshot_mode == "record":
+        for name, (store, examples) in snapshots.items():
+            added = record_results(store, ran.get(name, []), reports.get(name, []))
+            store.save(ex["input"] for ex in examples)
+            if added:
+                print(f"Recorded {added} new snapshot(s) in {store.path}")
+    for name, stats_dir in profile_dirs.items():
+        paths = sorted(Path(stats_dir).glob("*.prof"))
+        if name in ran:
+            profile(merge_stats(paths), name, len(paths))
+        shutil.rmtree(stats_dir, ignore_errors=True)
+    return reports
+
+
+def _cancel_after_first_failure(futures):
+    not_done = set(futures)
+    while not_done:
+        done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+        if any(not f.cancelled() and not f.result()["passed"] for f in done):
+            for future in not_done:
+                future.cancel()
+            return
+
+
+def print_summary(reports):
+    """Print the aggregated per-skill table. Returns the number of failing skills."""
+    print("=" * 69)
+    print(f"{'Skill':<32} {'Passed':>8} {'Failed':>8} {'Skipped':>8} {'Total':>8}")
+    failing = 0
+    totals = [0, 0, 0]
+    for name in sorted(reports):
+        results = reports[name]
+        if isinstance(results, str):
+            failing += 1
+            print(f"{name:<32} {'ERROR':>8}")
+            continue
+        passed = sum(1 for r in results if r["passed"])
+        skipped = sum(1 for r in results if r["skipped"])
+        failed = len(results) - passed - skipped
+        totals[0] += passed
+        totals[1] += failed
+        totals[2] += skipped
+        if failed or skipped:
+            failing += 1
+        print(f"{name:<32} {passed:>8} {failed:>8} {skipped:>8} {len(results):>8}")
+    print("-" * 69)
+    print(f"{'TOTAL':<32} {totals[0]:>8} {totals[1]:>8} {totals[2]:>8} {sum(totals):>8}")
+    return failing
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="Validate the examples of every skill in parallel"
+    )
+    p.add_argument(
+        "skills_root", nargs="?", default="skills", help="Skills directory (default: skills)"
+    )
+    p.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    p.add_argument("--timeout", type=int, default=10)
+    p.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Allow fuzzy comparison (ignore repeated whitespace)",
+    )
+    p.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Keep one --serve runner per skill alive in each worker",
+    )
+    p.add_argument(
+        "--fork-server",
+        action="store_true",
+        help="Keep one preloaded interpreter per skill in each worker and fork it per example",
+    )
+    p.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="INDEX/COUNT",
+        help="Run only shard INDEX (1-based) of COUNT deterministic slices of all examples",
+    )
+    p.add_argument(
+        "--timings",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="JSON report(s) from earlier runs used to balance shards by duration",
+    )
+    p.add_argument(
+        "--timings-out",
+        metavar="PATH",
+        help="Write the durations of this run's examples (cached ones from --timings)",
+    )
+    p.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only run skills changed since the merge base of REF and HEAD",
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-validate changed examples whenever files are saved",
+    )
+    add_limit_arguments(p)
+    add_output_arguments(p)
+    add_snapshot_arguments(p)
+    add_profile_arguments(p)
+    add_cache_arguments(p)
+    add_report_arguments(p)
+    add_diff_arguments(p)
+    args = p.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        p.error("--jobs must be at least 1")
+    if args.budget is not None and args.budget <= 0:
+        p.error("--budget must be positive")
+    if args.watch and args.shard:
+        p.error("--watch cannot be combined with --shard")
+    if args.persistent and args.fork_server:
+        p.error("--persistent cannot be combined with --fork-server")
+    if args.watch and (args.record or args.replay or args.profile):
+        p.error("--watch cannot be combined with --record, --replay or --profile")
+    if args.profile and (args.persistent or args.fork_server or args.record or args.replay):
+        p.error(
+            "--profile cannot be combined with --persistent, --fork-server, --record or --replay"
+        )
+    snapshot_mode = "record" if args.record else "replay" if args.replay else None
+    deadline = deadline_from_args(args)
+
+    if not Path(args.skills_root).is_dir():
+        print(f"❌ Error: Skills directory not found: {args.skills_root}")
+        sys.exit(1)
+
+    skills, skipped = discover_skills(args.skills_root)
+    if args.changed_since:
+        selected = {d.name for d in select_skills(args.skills_root, args.changed_since)}
+        skills = [skill for skill in skills if skill["name"] in selected]
+        skipped = [name for name in skipped if name in selected]
+        print(f"{len(skills)} skill(s) with examples changed since {args.changed_since}")
+    for name in skipped:
+        print(f"Skipping {name} - missing mock runner")
+
+    if args.watch:
+        index = index_from_args(args)
+        watch_skills(
+            skills,
+            run=lambda examples, runner, on_result: run_examples(
+                examples, runner, timeout=args.timeout, fuzzy=args.fuzzy, on_result=on_result
+            ),
+            load=lambda path: load_examples(path, index),
+            render=lambda result, name: formatter_from_args(args, name)(result),
+            make_runner=lambda cmd: make_runner(
+                cmd, persistent=True, max_output_bytes=args.max_output_bytes
+            ),
+        )
+        return
+
+    timings = {}
+    try:
+        timings = load_timings(args.timings)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring timing data: {e}")
+
+    reports = validate_all(
+        skills,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        fuzzy=args.fuzzy,
+        persistent=args.persistent,
+        fork_server=args.fork_server,
+        make_cache=None
+        if args.no_cache or snapshot_mode or args.profile
+        else lambda cmd: cache_from_args(args, cmd),
+        shard=args.shard,
+        timings=timings,
+        fail_fast=args.fail_fast,
+        deadline=deadline,
+        max_output_bytes=args.max_output_bytes,
+        index=index_from_args(args),
+        snapshot_mode=snapshot_mode,
+        profile=(lambda stats, name, runs: print_profile(args, stats, name, runs))
+        if args.profile
+        else None,
+    )
+    if args.shard:
+        selected = sum(len(r) for r in reports.values() if isinstance(r, list))
+        print(f"Shard {args.shard[0]}/{args.shard[1]}: {selected} example(s)")
+    if not args.no_cache:
+        prune_cache(
+            args.cache_dir or default_cache_dir(), int(args.cache_max_mb * 1024 * 1024)
+        )
+
+    for name in sorted(reports):
+        print(f"\n🚦 {name}")
+        results = reports[name]
+        if isinstance(results, str):
+            print(results)
+            continue
+        render = formatter_from_args(args, name)
+        for result in results:
+            print(render(result))
+
+    if args.timings_out:
+        save_timings(args.timings_out, timings, reports)
+    failing = print_summary(reports)
+    report_from_args(
+        args,
+        [
+            {
+                "name": skill["name"],
+                "examples": skill["examples"],
+                "runner": skill["runner"],
+                "results": reports[skill["name"]],
+            }
+            for skill in skills
+            if isinstance(reports.get(skill["name"]), list)
+        ],
+    )
+    if failing:
+        print(f"❌ {failing} skill(s) failed or skipped examples")
+        sys.exit(2)
+
+    print("✅ All skills passed")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1270 @@
+#!/usr/bin/env python3
+"""
+Example Validator - Smoke-tests a skill runner against references/examples.md
+
+Usage:
+    python validate_examples.py --examples <path/to/examples.md> --runner "<command>"
+
+Example:
+    python validate_examples.py --examples skills/humanize/references/examples.md \\
+        --runner "python skills/humanize/scripts/mock_runner.py"
+
+The runner command reads an example's input from stdin and writes the skill's
+output to stdout. `Input` / `Expected output` pairs are parsed from the examples
+file and compared after normalization (or fuzzily with --fuzzy).
+
+With --persistent the runner is started once as `<command> --serve` and fed
+examples as JSON lines (see example_runners.py); runners that do not support
+`--serve` fall back to one process per example. With --runner-module
+`path/to/mock_runner.py:func` the function is imported once and called
+in-process for every example. With --fork-server a `python script.py` runner is
+preloaded once in a warm interpreter and forked per example, skipping
+interpreter start-up and imports while keeping each example in a fresh process.
+With --jobs N up to N runner processes execute concurrently; results are still
+reported in example order.
+
+Passing results are cached on disk (see result_cache.py), so examples whose
+input, expected output, runner command, runner sources and comparison mode are
+unchanged are not re-executed. Parsed examples files are indexed in the same
+cache by path, size and mtime (see example_index.py), so unchanged files are not
+re-parsed. Use --no-cache to always parse the file and run the runner.
+
+--fail-fast stops at the first failing example and --budget SECONDS bounds the
+whole run; examples that were not run are reported as skipped and make the run
+fail. Timed-out or cancelled runners are killed with their whole process group.
+
+--record runs the runner for examples whose input has no snapshot yet and stores
+its real output in `examples.snapshots.json` next to the examples file (see
+example_snapshots.py); snapshots of removed inputs are dropped. --replay then
+compares against the recorded outputs without starting the runner at all.
+Both bypass the result cache.
+
+Runner output is captured incrementally, at most --max-output-bytes per stream;
+a runner exceeding it is killed. Output is checked against the expected text as
+it streams in, and the runner is stopped as soon as it can no longer match.
+
+--stress builds inputs from 1 KiB to 10 MiB out of the example inputs (repeated,
+concatenated and mutated), measures latency and peak memory per size and flags
+runners that scale super-linearly or fail at large sizes (see example_stress.py).
+
+--repeat N runs every example N times and reports its pass rate, distinct
+outputs and latency spread (see example_flaky.py). An example must pass every
+run to pass; examples passing fewer than --quarantine-below of their runs (but
+some) are quarantined: reported as skipped without failing the run. Repeated
+runs bypass the result cache.
+
+--profile runs Python runners under cProfile (see example_profile.py), merges
+the stats of all examples into `<skill>.pstats` in --profile-dir and prints the
+functions with the highest own time. Profiled runs bypass the result cache.
+
+This module is also the shared engine behind validate_all.py and the per-skill
+scripts/validate_examples.py wrappers.
+
+Exit code: 0 if all tests pass, 2 if any test fails or is skipped.
+"""
+
+import argparse
+import asyncio
+import codecs
+import hashlib
+import importlib
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+from difflib import unified_diff
+from pathlib import Path
+
+from example_index import ExampleIndex
+from example_reports import (
+    DEFAULT_MAX_DIFF_BYTES,
+    DEFAULT_MAX_DIFF_HUNKS,
+    bounded_diff,
+    describe_text,
+    format_latency_summary,
+    truncate_text,
+    write_json_report,
+    write_junit_xml,
+)
+from example_runners import (
+    DEFAULT_MAX_OUTPUT_BYTES,
+    CommandRunner,
+    ForkServerRunner,
+    ModuleRunner,
+    PersistentRunner,
+    RunnerAborted,
+)
+from result_cache import DEFAULT_MAX_BYTES, ResultCache, default_cache_dir
+
+# A label line ends with "Input:" / "Expected output:", optionally followed by
+# the opening fence; otherwise the fence follows on a later line.
+RE_LABEL = re.compile(r"(Input|Expected output):\s*(```text)?$")
+FENCE_OPEN = "```text"
+FENCE_CLOSE = "```"
+
+BUDGET_EXHAUSTED = "time budget exhausted"
+STOPPED_BY_FAIL_FAST = "stopped by --fail-fast"
+
+
+class ExamplesFormatError(ValueError):
+    """examples.md has an unpaired or unterminated block."""
+
+
+def import_mode(module, flag):
+    """
+    Import the module behind an optional mode on first use.
+
+    Packaged skills bundle only the modules a plain run needs (see
+    package_skill.py); a mode whose module is missing exits with an error.
+    """
+    try:
+        return importlib.import_module(module)
+    except ModuleNotFoundError as e:
+        if e.name != module:
+            raise
+        raise SystemExit(
+            f"Error: {flag} needs {module}.py, which packaged skills do not bundle; "
+            "run it from the repository"
+        )
+
+
+def parse_stress_sizes(value):
+    return import_mode("example_stress", "--stress-sizes").parse_sizes(value)
+
+
+def iter_examples(path):
+    """
+    Stream `Input` / `Expected output` pairs from an examples file.
+
+    The file is scanned line by line, so memory stays bounded by the largest
+    single example. Blocks are paired positionally: every `Input` block must be
+    followed by an `Expected output` block before the next `Input`.
+
+    Args:
+        path: Path to examples.md
+
+    Yields:
+        Dicts with `id`, `input`, `expected`, `line` (line of the `Input`
+        label), `expected_line` and `hash` (see example_hash())
+
+    Raises:
+        ExamplesFormatError: On an unpaired or unterminated block, with `path:line`
+    """
+    pending_input = None  # (text, line) of an Input block awaiting its Expected output
+    label = None  # (kind, line) of a label awaiting its opening fence
+    block = None  # (kind, line, lines) of the fenced block being read
+    count = 0
+
+    def error(line_no, message):
+        return ExamplesFormatError(f"{path}:{line_no}: {message}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if block is not None:
+                if not line.startswith(FENCE_CLOSE):
+                    block[2].append(line)
+                    continue
+                kind, start, lines = block
+                block = None
+                text = "".join(lines).strip()
+                if kind == "Input":
+                    if pending_input is not None:
+                        raise error(
+                            pending_input[1],
+                            "'Input' block has no matching 'Expected output' block",
+                        )
+                    pending_input = (text, start)
+                    continue
+                if pending_input is None:
+                    raise error(start, "'Expected output' block has no preceding 'Input' block")
+                count += 1
+                yield {
+                    "id": count,
+                    "input": pending_input[0],
+                    "expected": text,
+                    "line": pending_input[1],
+                    "expected_line": start,
+                    "hash": example_hash(pending_input[0], text),
+                }
+                pending_input = None
+                continue
+
+            stripped = line.strip()
+            if label is not None:
+                if stripped == FENCE_OPEN:
+                    block = (label[0], label[1], [])
+                    label = None
+                    continue
+                if stripped:
+                    # Label not followed by a text fence: ordinary prose
+                    label = None
+
+            match = RE_LABEL.search(stripped)
+            if match:
+                if match.group(2):
+                    block = (match.group(1), line_no, [])
+                else:
+                    label = (match.group(1), line_no)
+
+    if block is not None:
+        raise error(block[1], f"unterminated '{block[0]}' code fence")
+    if pending_input is not None:
+        raise error(pending_input[1], "'Input' block has no matching 'Expected output' block")
+
+
+def example_hash(input_text, expected):
+    """Short content hash identifying an example independently of its position."""
+    payload = json.dumps([input_text, expected])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_examples(path, index=None):
+    """
+    parse_examples() through an optional ExampleIndex.
+
+    Raises:
+        ExamplesFormatError: On an unpaired or unterminated block
+    """
+    if index is None:
+        return parse_examples(path)
+    return index.load(path, iter_examples)
+
+
+def stream_examples(path, index=None):
+    """
+    iter_examples() through an optional ExampleIndex, in bounded memory.
+
+    Raises:
+        ExamplesFormatError: On an unpaired or unterminated block
+    """
+    if index is None:
+        return iter_examples(path)
+    return index.iter(path, iter_examples)
+
+
+def parse_examples(path):
+    """
+    Parse all `Input` / `Expected output` pairs from an examples file.
+
+    Returns:
+        List of example dicts as yielded by iter_examples()
+
+    Raises:
+        ExamplesFormatError: On an unpaired or unterminated block
+    """
+    return list(iter_examples(path))
+
+
+def normalize(text):
+    # Basic normalization: strip trailing spaces on lines and remove extra blank lines
+    lines = [line.rstrip() for line in text.strip().splitlines()]
+    # Remove leading/trailing blank lines
+    while lines and lines[0] == "":
+        lines.pop(0)
+    while lines and lines[-1] == "":
+        lines.pop()
+    return "\n".join(lines)
+
+
+def outputs_match(expected, actual, fuzzy=False):
+    """Compare expected and actual output after normalization."""
+    if expected == actual:
+        return True
+    if fuzzy:
+        # collapse whitespace
+        return " ".join(expected.split()) == " ".join(actual.split())
+    return normalize(expected) == normalize(actual)
+
+
+class OutputWatch:
+    """
+    Incremental outputs_match() for streamed runner output.
+
+    Fed stdout chunks as they arrive, feed() returns False as soon as the
+    output can no longer match the expected text. Only complete lines (complete
+    tokens with fuzzy) are judged, so it never rejects an output that
+    outputs_match() would accept.
+    """
+
+    def __init__(self, expected, fuzzy=False):
+        self.fuzzy = fuzzy
+        self.expected = expected.split() if fuzzy else normalize(expected).splitlines()
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.pending = []
+        self.matched = 0
+        self.started = False
+
+    def feed(self, chunk):
+        text = self.decoder.decode(chunk)
+        # Only the new text is searched for the last item boundary
+        if self.fuzzy:
+            tail = text.rsplit(None, 1)[-1] if text and not text[-1].isspace() else ""
+            cut = len(text) - len(tail)
+        else:
+            cut = text.rfind("\n") + 1
+        if not cut:
+            self.pending.append(text)
+            return True
+        self.pending.append(text[:cut])
+        complete = "".join(self.pending)
+        self.pending = [text[cut:]]
+        if self.fuzzy:
+            return all(self._match(token) for token in complete.split())
+        return all(self._match_line(line) for line in complete.splitlines())
+
+    def _match(self, item):
+        if self.matched >= len(self.expected) or self.expected[self.matched] != item:
+            return False
+        self.matched += 1
+        return True
+
+    def _match_line(self, line):
+        # Mirrors normalize(): leading blank lines and trailing spaces do not count,
+        # and only blank lines may follow the last expected line
+        line = line.rstrip() if self.started else line.strip()
+        if not self.started and not line:
+            return True
+        self.started = True
+        if self.matched >= len(self.expected):
+            return not line
+        return self._match(line)
+
+
+def make_runner(
+    runner, persistent=False, fork_server=False, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES
+):
+    """Create the runner backend for a runner command; backends pass through."""
+    if not isinstance(runner, str):
+        return runner
+    if persistent:
+        return PersistentRunner(runner, max_output_bytes=max_output_bytes)
+    if fork_server:
+        return ForkServerRunner(runner, max_output_bytes=max_output_bytes)
+    return CommandRunner(runner, max_output_bytes=max_output_bytes)
+
+
+def remaining_timeout(timeout, deadline):
+    """
+    Per-example timeout capped by a global deadline.
+
+    Args:
+        timeout: Per-example timeout in seconds
+        deadline: Optional absolute time.time() value ending the run
+
+    Returns:
+        Seconds the next example may run, or None once the deadline has passed
+    """
+    if deadline is None:
+        return timeout
+    left = deadline - time.time()
+    if left <= 0:
+        return None
+    return min(timeout, left)
+
+
+def check_example(
+    example, runner, timeout=10, fuzzy=False, cache=None, deadline=None, stop_early=True
+):
+    """
+    Run one example through the runner and compare the output.
+
+    Args:
+        example: Example dict as returned by parse_examples()
+        runner: Runner backend from make_runner(), or a runner command string
+        timeout: Per-example timeout in seconds
+        fuzzy: Ignore repeated whitespace when comparing
+        cache: Optional ResultCache; a hit skips the runner
+        deadline: Optional absolute time.time() value; the example is skipped
+            once it has passed and its timeout never runs beyond it
+        stop_early: Stop the runner at the first output line that cannot
+            match; False lets every run finish
+
+    Returns:
+        Result dict as built by build_result() or skipped_result()
+    """
+    key, cached = cache_lookup(example, cache, fuzzy)
+    if cached:
+        return cached
+    timeout = remaining_timeout(timeout, deadline)
+    if timeout is None:
+        return skipped_result(example, BUDGET_EXHAUSTED)
+
+    runner = make_runner(runner)
+    watch = OutputWatch(example["expected"], fuzzy=fuzzy) if stop_early else None
+    start = time.perf_counter()
+    try:
+        rc, out, err = runner.run(example["input"], timeout=timeout, watch=watch)
+    except subprocess.TimeoutExpired:
+        rc, out, err = None, "", f"Runner timed out after {timeout:.3g}s"
+    except RunnerAborted as e:
+        rc, out, err = None, e.stdout, f"{e.stderr}\n{e}".strip()
+    except OSError as e:
+        # Same exit code /bin/sh reports for a missing command
+        rc, out, err = 127, "", str(e)
+    duration = time.perf_counter() - start
+    result = build_result(example, rc, out, err, fuzzy=fuzzy, duration=duration)
+    if key and result["passed"]:
+        cache.put(key, result)
+    return result
+
+
+def cache_lookup(example, cache, fuzzy=False):
+    """Return (cache key, cached result or None); the key is None without a cache."""
+    if not cache:
+        return None, None
+    key = cache.key(example, fuzzy)
+    hit = cache.get(key)
+    if hit is None:
+        return key, None
+    return key, build_result(
+        example, 0, hit["stdout"], hit["stderr"], fuzzy=fuzzy, cached=True
+    )
+
+
+async def check_example_async(
+    example, runner, timeout=10, fuzzy=False, cache=None, deadline=None, stop_early=True
+):
+    """Async check_example() for a CommandRunner or runner command."""
+    key, cached = cache_lookup(example, cache, fuzzy)
+    if cached:
+        return cached
+    timeout = remaining_timeout(timeout, deadline)
+    if timeout is None:
+        return skipped_result(example, BUDGET_EXHAUSTED)
+
+    runner = make_runner(runner)
+    watch = OutputWatch(example["expected"], fuzzy=fuzzy) if stop_early else None
+    start = time.perf_counter()
+    try:
+        rc, out, err = await runner.run_async(example["input"], timeout=timeout, watch=watch)
+    except subprocess.TimeoutExpired:
+        rc, out, err = None, "", f"Runner timed out after {timeout:.3g}s"
+    except RunnerAborted as e:
+        rc, out, err = None, e.stdout, f"{e.stderr}\n{e}".strip()
+    except OSError as e:
+        # Same exit code /bin/sh reports for a missing command in per-call mode
+        rc, out, err = 127, "", str(e)
+    duration = time.perf_counter() - start
+    result = build_result(example, rc, out, err, fuzzy=fuzzy, duration=duration)
+    if key and result["passed"]:
+        cache.put(key, result)
+    return result
+
+
+def build_result(example, rc, out, err, fuzzy=False, cached=False, duration=0.0):
+    """
+    Compare a runner's output and assemble the result dict.
+
+    Returns:
+        Dict with `id`, `line`, `passed`, `returncode`, `stdout`, `stderr`,
+        `expected`, `cached`, `skipped`, `duration` (runner wall time in
+        seconds), `compare_time`, `stdout_bytes` and `stderr_bytes`
+    """
+    start = time.perf_counter()
+    passed = outputs_match(example["expected"], out, fuzzy=fuzzy)
+    compare_time = time.perf_counter() - start
+    return {
+        "id": example["id"],
+        "line": example.get("line"),
+        "passed": passed,
+        "returncode": rc,
+        "stdout": out,
+        "stderr": err,
+        "expected": example["expected"],
+        "cached": cached,
+        "skipped": False,
+        "duration": duration,
+        "compare_time": compare_time,
+        "stdout_bytes": len(out.encode("utf-8")),
+        "stderr_bytes": len(err.encode("utf-8")),
+    }
+
+
+def skipped_result(example, reason):
+    """Result dict for an example that was not run; `stderr` holds the reason."""
+    result = build_result(example, None, "", reason)
+    result["passed"] = False
+    result["skipped"] = True
+    return result
+
+
+def format_result(
+    result,
+    max_hunks=DEFAULT_MAX_DIFF_HUNKS,
+    max_bytes=DEFAULT_MAX_DIFF_BYTES,
+    diff_dir=None,
+    name="examples",
+):
+    """
+    Render a result dict as the human-readable PASS/FAIL block.
+
+    Expected/actual text and stderr are cut to max_bytes and the diff to the
+    first max_hunks hunks. With diff_dir, the complete diff is written to
+    `<diff_dir>/<name>-test-<id>.diff` and only its location is printed.
+    """
+    lines = [f"--- Test #{result['id']} ---"]
+    if result.get("skipped"):
+        lines.append(f"SKIPPED ({result['stderr']})\n")
+        return "\n".join(lines)
+    if result["stderr"]:
+        lines.append(f"Runner stderr:\n{truncate_text(result['stderr'], max_bytes)}\n")
+    if result["returncode"] not in (0, None):
+        lines.append(f"Runner exited with code {result['returncode']}")
+    if result["passed"]:
+        lines.append("PASS (cached)\n" if result.get("cached") else "PASS\n")
+        return "\n".join(lines)
+
+    expected = result["expected"]
+    actual = result["stdout"]
+    lines.append("FAIL")
+    lines.append(f"Expected: {describe_text(expected)}; actual: {describe_text(actual)}")
+    if diff_dir:
+        path = write_full_diff(diff_dir, f"{name}-test-{result['id']}.diff", expected, actual)
+        lines.append(f"Full diff written to {path}")
+        lines.append("")
+        return "\n".join(lines)
+    lines.append("--- Expected ---")
+    lines.append(truncate_text(expected, max_bytes))
+    lines.append("--- Actual ---")
+    lines.append(truncate_text(actual, max_bytes))
+    lines.append("--- Diff ---")
+    lines.extend(bounded_diff(expected, actual, max_hunks=max_hunks, max_bytes=max_bytes))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_full_diff(diff_dir, filename, expected, actual):
+    path = Path(diff_dir) / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        diff = unified_diff(
+            expected.splitlines(), actual.splitlines(), "expected", "actual", lineterm=""
+        )
+        for line in diff:
+            f.write(line + "\n")
+    return path
+
+
+def run_examples(
+    examples,
+    runner,
+    timeout=10,
+    fuzzy=False,
+    jobs=1,
+    on_result=None,
+    cache=None,
+    fail_fast=False,
+    deadline=None,
+    stop_early=True,
+):
+    """
+    Run examples through a runner, optionally several at once.
+
+    Args:
+        examples: Iterable of example dicts, e.g. from iter_examples()
+        runner: Runner backend or command string; jobs > 1 requires a
+            CommandRunner or command
+        timeout: Per-example timeout in seconds
+        fuzzy: Ignore repeated whitespace when comparing
+        jobs: Maximum number of concurrently running runner processes
+        on_result: Optional callback invoked with each result, in example order
+        cache: Optional ResultCache consulted before running each example
+        fail_fast: Skip the remaining examples after the first failure,
+            cancelling runners still in flight
+        deadline: Optional absolute time.time() value ending the run; later
+            examples are skipped
+        stop_early: Stop runners whose output can no longer match
+
+    Returns:
+        List of result dicts, in example order
+    """
+    if jobs > 1:
+        return asyncio.run(
+            _run_examples_async(
+                examples,
+                runner,
+                timeout,
+                fuzzy,
+                jobs,
+                on_result,
+                cache,
+                fail_fast,
+                deadline,
+                stop_early,
+            )
+        )
+
+    results = []
+    failed = False
+    for ex in examples:
+        if failed and fail_fast:
+            result = skipped_result(ex, STOPPED_BY_FAIL_FAST)
+        else:
+            result = check_example(
+                ex,
+                runner,
+                timeout=timeout,
+                fuzzy=fuzzy,
+                cache=cache,
+                deadline=deadline,
+                stop_early=stop_early,
+            )
+            failed = failed or not result["passed"]
+        if on_result:
+            on_result(result)
+        results.append(result)
+    return results
+
+
+async def _run_examples_async(
+    examples, runner, timeout, fuzzy, jobs, on_result, cache, fail_fast, deadline, stop_early
+):
+    semaphore = asyncio.Semaphore(jobs)
+    # Only a small window of examples is scheduled ahead, so streaming inputs stay
+    # bounded; tasks are awaited in example order to keep reporting deterministic.
+    window = deque()
+    results = []
+    stopped = False
+
+    async def bounded(ex):
+        nonlocal stopped
+        async with semaphore:
+            if stopped:
+                return skipped_result(ex, STOPPED_BY_FAIL_FAST)
+            result = await check_example_async(
+                ex,
+                runner,
+                timeout=timeout,
+                fuzzy=fuzzy,
+                cache=cache,
+                deadline=deadline,
+                stop_early=stop_early,
+            )
+        if fail_fast and not result["passed"] and not stopped:
+            # Cancelling kills the runners of examples still in flight
+            stopped = True
+            for _, task in window:
+                if task is not asyncio.current_task():
+                    task.cancel()
+        return result
+
+    async def take_oldest():
+        ex, task = window.popleft()
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            result = skipped_result(ex, STOPPED_BY_FAIL_FAST)
+        if on_result:
+            on_result(result)
+        results.append(result)
+
+    for ex in examples:
+        window.append((ex, asyncio.create_task(bounded(ex))))
+        if len(window) >= 2 * jobs:
+            await take_oldest()
+    while window:
+        await take_oldest()
+    return results
+
+
+def validate_examples(
+    examples_path,
+    runner,
+    timeout=10,
+    fuzzy=False,
+    persistent=False,
+    fork_server=False,
+    max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES,
+    jobs=1,
+    cache=None,
+    index=None,
+    fail_fast=False,
+    deadline=None,
+):
+    """
+    Run every example of one examples file.
+
+    Args:
+        examples_path: Path to examples.md
+        runner: Runner backend or command string; see make_runner() and
+            run_examples() for the remaining options
+
+    Returns:
+        List of result dicts, in example order
+    """
+    examples = load_examples(examples_path, index)
+    backend = make_runner(
+        runner, persistent=persistent, fork_server=fork_server, max_output_bytes=max_output_bytes
+    )
+    try:
+        return run_examples(
+            examples,
+            backend,
+            timeout=timeout,
+            fuzzy=fuzzy,
+            jobs=jobs,
+            cache=cache,
+            fail_fast=fail_fast,
+            deadline=deadline,
+        )
+    finally:
+        backend.close()
+
+
+def build_parser():
+    p = argparse.ArgumentParser(
+        description="Smoke-test a skill runner against references/examples.md"
+    )
+    p.add_argument("--examples", required=True, help="Path to examples.md")
+    runner = p.add_mutually_exclusive_group()
+    runner.add_argument(
+        "--runner",
+        help='Runner command (reads stdin, writes stdout). e.g. "python mock_runner.py"',
+    )
+    runner.add_argument(
+        "--runner-module",
+        metavar="PATH:FUNC",
+        help='Call a Python function in-process, e.g. "scripts/mock_runner.py:run"',
+    )
+    p.add_argument("--timeout", type=int, default=10)
+    p.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Allow fuzzy comparison (ignore repeated whitespace)",
+    )
+    p.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Start the runner once with --serve and stream examples as JSON lines",
+    )
+    p.add_argument(
+        "--fork-server",
+        action="store_true",
+        help="Preload a 'python script.py' runner once and fork it per example",
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run up to N examples concurrently (per-call --runner mode only)",
+    )
+    add_limit_arguments(p)
+    add_output_arguments(p)
+    add_snapshot_arguments(p)
+    add_profile_arguments(p)
+    add_repeat_arguments(p)
+    p.add_argument(
+        "--snapshots",
+        metavar="PATH",
+        help="Snapshot store for --record/--replay (default: examples.snapshots.json "
+        "next to the examples file)",
+    )
+    add_cache_arguments(p)
+    add_report_arguments(p)
+    add_diff_arguments(p)
+    bench = p.add_argument_group("benchmark mode")
+    bench.add_argument(
+        "--bench",
+        action="store_true",
+        help="Time the runner on every example instead of validating outputs",
+    )
+    bench.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per example")
+    bench.add_argument("--iterations", type=int, default=5, help="Measured runs per example")
+    bench.add_argument(
+        "--baseline-out", metavar="PATH", help="Save benchmark results as baseline JSON"
+    )
+    bench.add_argument(
+        "--baseline", metavar="PATH", help="Compare against a saved baseline JSON"
+    )
+    stress = p.add_argument_group("stress mode")
+    stress.add_argument(
+        "--stress",
+        action="store_true",
+        help="Measure how the runner scales on synthetic inputs built from the examples",
+    )
+    stress.add_argument(
+        "--stress-sizes",
+        type=parse_stress_sizes,
+        metavar="SIZES",
+        help='Comma-separated input sizes, e.g. "1K,64K,1M" (default: 1K to 10M)',
+    )
+    stress.add_argument(
+        "--stress-runs", type=int, default=3, help="Measured runs per size; the fastest is kept"
+    )
+    stress.add_argument(
+        "--max-exponent",
+        type=float,
+        help="Flag latency or memory growing faster than size**K (default: 1.2)",
+    )
+    return p
+
+
+def add_limit_arguments(p):
+    p.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failing example and skip the rest",
+    )
+    p.add_argument(
+        "--budget",
+        type=float,
+        metavar="SECONDS",
+        help="Time budget for the whole run; examples left when it runs out are skipped",
+    )
+
+
+def add_output_arguments(p):
+    p.add_argument(
+        "--max-output-bytes",
+        type=int,
+        default=DEFAULT_MAX_OUTPUT_BYTES,
+        metavar="N",
+        help="Kill a runner whose stdout or stderr exceeds N bytes (default: %(default)s)",
+    )
+
+
+def add_snapshot_arguments(p):
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        action="store_true",
+        help="Record runner output for examples whose input has no snapshot yet",
+    )
+    mode.add_argument(
+        "--replay",
+        action="store_true",
+        help="Compare against recorded snapshots instead of running the runner",
+    )
+
+
+def add_profile_arguments(p):
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the Python runner with cProfile and merge the stats of all examples",
+    )
+    p.add_argument(
+        "--profile-dir",
+        default=".",
+        metavar="DIR",
+        help="Where --profile writes <skill>.pstats (default: current directory)",
+    )
+    p.add_argument(
+        "--profile-top",
+        type=int,
+        metavar="N",
+        help="Hot functions listed by --profile (default: 15)",
+    )
+
+
+def add_repeat_arguments(p):
+    p.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run every example N times and report pass rate and latency spread",
+    )
+    p.add_argument(
+        "--quarantine-below",
+        type=float,
+        metavar="RATE",
+        help="With --repeat, quarantine examples passing some but fewer than RATE of "
+        "their runs instead of failing (default: 0.5)",
+    )
+    p.add_argument(
+        "--repeat-report",
+        metavar="PATH",
+        help="With --repeat, write per-example pass rates and latency statistics as JSON",
+    )
+
+
+def print_profile(args, stats, name, runs):
+    """Save merged profile stats and print the hot-function table."""
+    if stats is None:
+        print(f"No profile collected for {name}")
+        return
+    profile = import_mode("example_profile", "--profile")
+    top = profile.DEFAULT_TOP if args.profile_top is None else args.profile_top
+    path = profile.save_stats(stats, args.profile_dir, name)
+    print(profile.format_hot_functions(stats, name, runs, top=top))
+    print(f"Profile saved to {path}")
+
+
+def deadline_from_args(args):
+    """Absolute time.time() deadline for --budget, or None."""
+    return time.time() + args.budget if args.budget is not None else None
+
+
+def add_report_arguments(p):
+    p.add_argument(
+        "--json-report", metavar="PATH", help="Write a JSON report with per-example timings"
+    )
+    p.add_argument(
+        "--junit-xml", metavar="PATH", help="Write a JUnit XML report with per-test durations"
+    )
+    p.add_argument(
+        "--slowest",
+        type=int,
+        default=5,
+        metavar="N",
+        help="List the N slowest examples in the latency summary (default: 5)",
+    )
+
+
+def add_diff_arguments(p):
+    p.add_argument(
+        "--max-diff-hunks",
+        type=int,
+        default=DEFAULT_MAX_DIFF_HUNKS,
+        help="Show at most N differing hunks per failure (default: %(default)s)",
+    )
+    p.add_argument(
+        "--max-diff-bytes",
+        type=int,
+        default=DEFAULT_MAX_DIFF_BYTES,
+        help="Cap printed expected/actual/diff text per failure (default: %(default)s)",
+    )
+    p.add_argument(
+        "--diff-dir",
+        metavar="DIR",
+        help="Write full diffs of failures to DIR instead of printing them",
+    )
+
+
+def formatter_from_args(args, name):
+    """Return a result -> text function honouring the diff options."""
+    return lambda result: format_result(
+        result,
+        max_hunks=args.max_diff_hunks,
+        max_bytes=args.max_diff_bytes,
+        diff_dir=args.diff_dir,
+        name=name,
+    )
+
+
+def report_from_args(args, suites):
+    """Print the latency summary and write the reports requested on the command line."""
+    print(format_latency_summary(suites, top=args.slowest))
+    if args.json_report:
+        write_json_report(args.json_report, suites)
+    if args.junit_xml:
+        write_junit_xml(args.junit_xml, suites)
+
+
+def add_cache_arguments(p):
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse examples and run the runner instead of reusing cached results",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help=f"Result cache directory (default: {default_cache_dir()})",
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size",
+    )
+
+
+def index_from_args(args):
+    """Build the ExampleIndex requested on the command line, or None."""
+    if args.no_cache:
+        return None
+    return ExampleIndex(args.cache_dir or default_cache_dir())
+
+
+def cache_from_args(args, runner_spec):
+    """Build the ResultCache requested on the command line, or None."""
+    if args.no_cache:
+        return None
+    return ResultCache(
+        args.cache_dir or default_cache_dir(),
+        runner_spec,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+    )
+
+
+def suite_name(examples_path):
+    """Skill name for `<skill>/references/examples.md`, else the file stem."""
+    path = Path(examples_path).resolve()
+    if path.parent.name == "references" and path.parent.parent.name:
+        return path.parent.parent.name
+    return path.stem
+
+
+def run_bench(args, runner):
+    bench_mode = import_mode("example_bench", "--bench")
+    name = suite_name(args.examples)
+    runner_spec = args.runner_module or args.runner
+    baseline = None
+    try:
+        # Fail before benchmarking rather than after
+        if args.baseline:
+            baseline = bench_mode.load_baseline(args.baseline)
+        bench = bench_mode.bench_examples(
+            iter_examples(args.examples),
+            runner,
+            warmup=args.warmup,
+            iterations=args.iterations,
+            timeout=args.timeout,
+        )
+    except ExamplesFormatError as e:
+        raise SystemExit(f"Error parsing examples: {e}")
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    finally:
+        runner.close()
+
+    print(bench_mode.format_bench(bench, name))
+    if baseline:
+        print(bench_mode.compare_baseline(args.baseline, bench, baseline))
+    if args.baseline_out:
+        bench_mode.save_baseline(args.baseline_out, bench, name, runner_spec, args.warmup, args.iterations)
+        print(f"Baseline saved to {args.baseline_out}")
+
+
+def run_stress(args, runner):
+    stress = import_mode("example_stress", "--stress")
+    name = suite_name(args.examples)
+    sizes = args.stress_sizes or list(stress.DEFAULT_SIZES)
+    max_exponent = args.max_exponent
+    if max_exponent is None:
+        max_exponent = stress.DEFAULT_MAX_EXPONENT
+    try:
+        report = stress.stress_examples(
+            iter_examples(args.examples),
+            runner,
+            sizes=sizes,
+            runs=args.stress_runs,
+            timeout=args.timeout,
+            max_exponent=max_exponent,
+        )
+    except ExamplesFormatError as e:
+        raise SystemExit(f"Error parsing examples: {e}")
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    finally:
+        runner.close()
+
+    print(stress.format_stress(report, name, max_exponent))
+    flagged = [s for s, r in report["strategies"].items() if r["flagged"]]
+    if flagged:
+        print(f"{len(flagged)} strategy(ies) scale super-linearly or fail")
+        sys.exit(2)
+    print("No super-linear scaling or failures found")
+
+
+def run_repeated(args, runner, examples, render, deadline=None):
+    """
+    Run every example --repeat times and reduce the runs per example.
+
+    Every run goes to completion, without stopping at the first wrong line, so
+    latencies and distinct outputs reflect what the runner really does.
+
+    Returns:
+        List of representative result dicts, in example order
+    """
+    flaky = import_mode("example_flaky", "--repeat")
+    threshold = flaky.DEFAULT_THRESHOLD if args.quarantine_below is None else args.quarantine_below
+    runs = [
+        run_examples(
+            examples,
+            runner,
+            timeout=args.timeout,
+            fuzzy=args.fuzzy,
+            jobs=args.jobs,
+            deadline=deadline,
+            stop_early=False,
+        )
+        for _ in range(args.repeat)
+    ]
+    name = suite_name(args.examples)
+    rows = []
+    results = []
+    for i, ex in enumerate(examples):
+        ex_runs = [run[i] for run in runs]
+        row = flaky.flakiness(ex, ex_runs, threshold)
+        if row is None:
+            results.append(ex_runs[-1])
+            continue
+        rows.append(row)
+        results.append(flaky.representative(ex_runs, row))
+    for result in results:
+        print(render(result))
+    print(flaky.format_flakiness(rows, name, args.repeat, args.timeout))
+    if args.repeat_report:
+        flaky.write_repeat_report(args.repeat_report, rows, name, args.repeat, threshold)
+    return results
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if not args.replay and not (args.runner or args.runner_module):
+        parser.error("one of the arguments --runner --runner-module is required")
+    if args.jobs > 1 and (
+        args.runner_module
+        or args.persistent
+        or args.fork_server
+        or args.record
+        or args.replay
+        or args.profile
+    ):
+        parser.error(
+            "--jobs cannot be combined with --runner-module, --persistent, --fork-server, "
+            "--record, --replay or --profile"
+        )
+    if args.profile and (
+        args.persistent or args.fork_server or args.record or args.replay or args.bench or args.stress
+    ):
+        parser.error(
+            "--profile cannot be combined with --persistent, --fork-server, --record, --replay, "
+            "--bench or --stress"
+        )
+    if (args.bench or args.stress) and (args.record or args.replay):
+        parser.error("--bench and --stress cannot be combined with --record or --replay")
+    if args.bench and args.stress:
+        parser.error("--bench cannot be combined with --stress")
+    if args.stress and (args.persistent or args.fork_server or args.stress_runs < 1):
+        parser.error("--stress runs one process per input and needs --stress-runs >= 1")
+    if args.persistent and args.fork_server:
+        parser.error("--persistent cannot be combined with --fork-server")
+    if args.bench and (args.iterations < 1 or args.warmup < 0):
+        parser.error("--bench needs --iterations >= 1 and --warmup >= 0")
+    if args.budget is not None and args.budget <= 0:
+        parser.error("--budget must be positive")
+    if args.repeat < 1 or (
+        args.quarantine_below is not None and not 0 <= args.quarantine_below <= 1
+    ):
+        parser.error("--repeat must be at least 1 and --quarantine-below between 0 and 1")
+    if args.repeat > 1 and (
+        args.fail_fast or args.record or args.replay or args.profile or args.bench or args.stress
+    ):
+        parser.error(
+            "--repeat cannot be combined with --fail-fast, --record, --replay, --profile, "
+            "--bench or --stress"
+        )
+    if args.max_output_bytes < 1:
+        parser.error("--max-output-bytes must be at least 1")
+
+    store = None
+    if args.record or args.replay:
+        snapshots = import_mode("example_snapshots", "--record/--replay")
+        try:
+            store = snapshots.SnapshotStore(
+                args.snapshots or snapshots.snapshot_path(args.examples)
+            )
+        except ValueError as e:
+            raise SystemExit(f"Error loading snapshots: {e}")
+
+    if args.replay:
+        runner = snapshots.SnapshotRunner(store)
+    elif args.runner_module:
+        try:
+            runner = ModuleRunner(args.runner_module)
+        except ValueError as e:
+            raise SystemExit(f"Error loading runner module: {e}")
+    else:
+        runner = make_runner(
+            args.runner,
+            persistent=args.persistent,
+            fork_server=args.fork_server,
+            max_output_bytes=args.max_output_bytes,
+        )
+    if args.record:
+        runner = snapshots.SnapshotRunner(store, runner)
+    if args.profile:
+        try:
+            runner = import_mode("example_profile", "--profile").ProfilingRunner(
+                runner if args.runner_module else args.runner,
+                max_output_bytes=args.max_output_bytes,
+            )
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+    if args.bench:
+        run_bench(args, runner)
+        return
+    if args.stress:
+        run_stress(args, runner)
+        return
+
+    runner_spec = args.runner_module or args.runner
+    if store or args.profile or args.repeat > 1:
+        cache = None
+    else:
+        cache = cache_from_args(args, runner_spec)
+    index = index_from_args(args)
+    deadline = deadline_from_args(args)
+    name = suite_name(args.examples)
+    render = formatter_from_args(args, name)
+    try:
+        # Streamed unless the examples are needed more than once, so huge files
+        # stay in bounded memory
+        if args.record or args.repeat > 1:
+            examples = load_examples(args.examples, index)
+        else:
+            examples = stream_examples(args.examples, index)
+        if args.repeat > 1:
+            results = run_repeated(args, runner, examples, render, deadline)
+        else:
+            results = run_examples(
+                examples,
+                runner,
+                timeout=args.timeout,
+                fuzzy=args.fuzzy,
+                jobs=args.jobs,
+                on_result=lambda result: print(render(result), flush=True),
+                cache=cache,
+                fail_fast=args.fail_fast,
+                deadline=deadline,
+            )
+        if args.profile:
+            print_profile(args, runner.stats(), name, runner.runs)
+    except ExamplesFormatError as e:
+        raise SystemExit(f"Error parsing examples: {e}")
+    finally:
+        runner.close()
+        if cache:
+            cache.prune()
+
+    suite = {
+        "name": name,
+        "examples": args.examples,
+        "runner": runner.cmd if args.replay else runner_spec,
+        "results": results,
+    }
+    if args.record:
+        store.save(ex["input"] for ex in examples)
+        print(f"Recorded {runner.recorded} new snapshot(s) in {store.path}")
+    report_from_args(args, [suite])
+
+    failures = sum(1 for r in results if not r["passed"] and not r["skipped"])
+    quarantined = sum(1 for r in results if r.get("quarantined"))
+    skipped = sum(1 for r in results if r["skipped"]) - quarantined
+    if failures:
+        print(f"{failures} test(s) failed")
+    if quarantined:
+        print(f"{quarantined} flaky test(s) quarantined")
+    if skipped:
+        print(f"{skipped} test(s) not run")
+    if failures or skipped:
+        sys.exit(2)
+
+    if quarantined:
+        print("No test failed")
+    else:
+        print("All tests passed")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
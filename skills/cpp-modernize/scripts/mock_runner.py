@@ -4,7 +4,9 @@
 It applies a small, deterministic transformation to input examples for smoke tests.
 """
 
+import json
 import sys
+from typing import Callable
 
 
 def standard_response(
@@ -351,7 +353,24 @@ def modernize_text(s: str) -> str:
     return s
 
 
+def serve(handler: Callable[[str], str]) -> None:
+    """Persistent mode (--serve): answer JSON-lines requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = {"id": request.get("id"), "output": handler(request["input"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    data = sys.stdin.read()
-    out = modernize_text(data)
-    sys.stdout.write(out)
+    if "--serve" in sys.argv[1:]:
+        serve(modernize_text)
+    else:
+        data = sys.stdin.read()
+        out = modernize_text(data)
+        sys.stdout.write(out)
@@ -7,7 +7,9 @@ references/examples.md.
 Real deployments should replace this with the real skill runtime.
 """
 
+import json
 import sys
+from typing import Callable
 
 EX1_MARKER = "Backend Engineer (Go)"
 EX2_MARKER = "Site Reliability Engineer (SRE)"
@@ -170,6 +172,23 @@ def run(text: str) -> str:
     return s
 
 
+def serve(handler: Callable[[str], str]) -> None:
+    """Persistent mode (--serve): answer JSON-lines requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = {"id": request.get("id"), "output": handler(request["input"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    data = sys.stdin.read()
-    sys.stdout.write(run(data))
+    if "--serve" in sys.argv[1:]:
+        serve(run)
+    else:
+        data = sys.stdin.read()
+        sys.stdout.write(run(data))
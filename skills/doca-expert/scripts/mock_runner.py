@@ -4,7 +4,9 @@
 Deterministic, short responses used by `validate_examples.py`.
 """
 
+import json
 import sys
+from typing import Callable
 
 
 def run_prompt(s: str) -> str:
@@ -144,7 +146,24 @@ def run_prompt(s: str) -> str:
     return "Ask me a DOCA Flow or SmartNIC question (e.g., '5-tuple classifier', 'tail latency')."
 
 
+def serve(handler: Callable[[str], str]) -> None:
+    """Persistent mode (--serve): answer JSON-lines requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = {"id": request.get("id"), "output": handler(request["input"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    data = sys.stdin.read()
-    out = run_prompt(data)
-    sys.stdout.write(out)
+    if "--serve" in sys.argv[1:]:
+        serve(run_prompt)
+    else:
+        data = sys.stdin.read()
+        out = run_prompt(data)
+        sys.stdout.write(out)
@@ -5,7 +5,9 @@ This runner reads stdin and emits a very small transformation of the input.
 It's intentionally simple - real deployments should replace this with the real skill runner.
 """
 
+import json
 import sys
+from typing import Callable
 
 
 def humanize_text(s: str) -> str:
@@ -28,7 +30,24 @@ def humanize_text(s: str) -> str:
     return s
 
 
+def serve(handler: Callable[[str], str]) -> None:
+    """Persistent mode (--serve): answer JSON-lines requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = {"id": request.get("id"), "output": handler(request["input"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
-    data = sys.stdin.read()
-    out = humanize_text(data)
-    sys.stdout.write(out)
+    if "--serve" in sys.argv[1:]:
+        serve(humanize_text)
+    else:
+        data = sys.stdin.read()
+        out = humanize_text(data)
+        sys.stdout.write(out)
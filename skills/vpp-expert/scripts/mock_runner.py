@@ -1,11 +1,31 @@
 #!/usr/bin/env python3
+import json
 import sys
+from typing import Callable
+
 
 # Minimal mock runner for vpp-skill examples
-if __name__ == "__main__":
-    data = sys.stdin.read()
+def run(data: str) -> str:
     # Echo input back in a simple deterministic way for tests
-    print("Input:")
-    print(data.strip())
-    print("\nResponse:")
-    print("This is a mock response from vpp-skill")
+    return f"Input:\n{data.strip()}\n\nResponse:\nThis is a mock response from vpp-skill"
+
+
+def serve(handler: Callable[[str], str]) -> None:
+    """Persistent mode (--serve): answer JSON-lines requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            response = {"id": request.get("id"), "output": handler(request["input"])}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv[1:]:
+        serve(run)
+    else:
+        print(run(sys.stdin.read()))
@@ -1,6 +1,28 @@
 #!/usr/bin/env python3
+"""Smoke-test runner for the `vpp-expert` skill examples.
+
+Usage:
+  python validate_examples.py --examples ../references/examples.md --runner "python mock_runner.py"
+
+Thin wrapper around the shared validator in
+.github/skills/skill-creator/scripts/validate_examples.py (bundled as
+scripts/validator/ in packaged skills); all options are forwarded.
+"""
+
+import runpy
 import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+CANDIDATES = (
+    # Bundled next to this wrapper by package_skill.py in .skill archives
+    HERE / "validator" / "validate_examples.py",
+    HERE.parents[2] / ".github" / "skills" / "skill-creator" / "scripts" / "validate_examples.py",
+)
 
-# Simple validator stub for examples.md - for local smoke tests
 if __name__ == "__main__":
-    print("validate_examples: OK")
+    shared = next((path for path in CANDIDATES if path.is_file()), None)
+    if shared is None:
+        sys.exit(f"Shared validator not found: {' or '.join(map(str, CANDIDATES))}")
+    sys.path.insert(0, str(shared.parent))
+    runpy.run_path(str(shared), run_name="__main__")